@@ -0,0 +1 @@
+# Benchmarks do InvestData (veja benchmarks/run.py)
@@ -0,0 +1,112 @@
+import collections
+import datetime
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Servidor local que imita a API SGS do Banco Central, usado nos benchmarks e testes de carga
+# Gera séries sintéticas (mensais para CDI/Selic e diárias para CDI/Selic/TR), respeita os
+# parâmetros dataInicial/dataFinal, e permite configurar latência e taxa de falhas. Como a API real,
+# recusa consultas a séries diárias sem intervalo ou com intervalo maior que MAX_DAILY_YEARS anos.
+
+MONTHLY_SERIES = {4391: 0.9, 4390: 0.88}
+DAILY_SERIES = {12: 0.045, 11: 0.044, 226: 0.07}
+MAX_DAILY_YEARS = 10
+FIRST_DATE = datetime.date(2000, 1, 1)
+
+# Pontos sintéticos de uma série: [(data, valor), ...]
+def _series(code):
+    today = datetime.date.today()
+    if code in DAILY_SERIES:
+        days = (FIRST_DATE + datetime.timedelta(days=i) for i in range((today - FIRST_DATE).days + 1))
+        return [(day, DAILY_SERIES[code] * (1 + 0.2 * ((day.toordinal() % 30) / 30 - 0.5)))
+                for day in days if day.weekday() < 5]
+    months = (today.year - FIRST_DATE.year) * 12 + today.month
+    return [(datetime.date(FIRST_DATE.year + i // 12, i % 12 + 1, 1), MONTHLY_SERIES[code] * (1 + 0.1 * ((i % 24) / 24 - 0.5)))
+            for i in range(months)]
+
+class StubBCBServer:
+    # latency: segundos de espera por requisição; failure_rate: fração das requisições que respondem 500
+    def __init__(self, latency=0.0, failure_rate=0.0, seed=None, port=0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.requests = 0
+        self.series_requests = collections.Counter()  # requisições por código de série
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._data = {code: _series(code) for code in (*MONTHLY_SERIES, *DAILY_SERIES)}
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    # Responde uma requisição GET e devolve (status, corpo)
+    def respond(self, path):
+        parsed = urlparse(path)
+        match = re.search(r'bcdata\.sgs\.(\d+)/dados', parsed.path)
+        with self._lock:
+            self.requests += 1
+            self.series_requests[int(match.group(1)) if match else None] += 1
+            fail = self._random.random() < self.failure_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if fail:
+            return 500, b'{"erro": "falha simulada"}'
+
+        if not match or int(match.group(1)) not in self._data:
+            return 404, b'[]'
+        code = int(match.group(1))
+        points = self._data[code]
+
+        query = parse_qs(parsed.query)
+        if code in DAILY_SERIES and 'dataInicial' not in query:
+            return 406, b'{"erro": "consulta de serie diaria sem intervalo de datas"}'
+        if 'dataInicial' in query:
+            start = datetime.datetime.strptime(query['dataInicial'][0], '%d/%m/%Y').date()
+            end = datetime.datetime.strptime(query['dataFinal'][0], '%d/%m/%Y').date() if 'dataFinal' in query else datetime.date.today()
+            if code in DAILY_SERIES and (end - start).days > MAX_DAILY_YEARS * 366:
+                return 406, b'{"erro": "intervalo maior que 10 anos para serie diaria"}'
+            points = [(day, value) for day, value in points if start <= day <= end]
+            if not points:
+                return 404, b'{"erro": "Value(s) not found"}'
+        return 200, json.dumps([{'data': day.strftime('%d/%m/%Y'), 'valor': f'{value:.6f}'} for day, value in points]).encode()
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, body = stub.respond(self.path)
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
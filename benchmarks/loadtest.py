@@ -0,0 +1,430 @@
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+# Teste de carga com várias sessões simultâneas
+#
+#   python -m benchmarks.loadtest                                  # 16 sessões, 4 ao mesmo tempo
+#   python -m benchmarks.loadtest --sessions 64 --concurrency 8    # mais carga
+#   python -m benchmarks.loadtest --latency 0.5 --failure-rate 0.2 # API do Banco Central lenta e instável
+#   python -m benchmarks.loadtest --mode threads --concurrency 16  # sessões dividindo um único processo
+#
+# Sobe o servidor local que imita a API do Banco Central (benchmarks/bcb_stub.py), com latência e
+# taxa de falhas configuráveis, e roda as sessões simuladas dos simuladores de Renda Fixa, Cofrinhos
+# e Fundos Imobiliários com entradas sorteadas. O armazenamento local das taxas começa vazio (a menos
+# que --warm peça as taxas antes), então as primeiras sessões encontram o cache frio ao mesmo tempo.
+#
+# Dois modos:
+# - processes: cada sessão abre as páginas pelo AppTest do Streamlit e simula. O AppTest troca estado
+#   global do Streamlit a cada execução e não pode rodar em várias threads do mesmo processo, então
+#   as sessões simultâneas rodam em processos separados (concurrency processos, cada um rodando suas
+#   sessões uma depois da outra), como vários workers do servidor.
+# - threads: as sessões rodam em concurrency threads de um único processo, como o servidor do
+#   Streamlit faz com as sessões de um worker, chamando o que as páginas chamam (serviço de taxas,
+#   cache de resultados, cálculos e montagem dos gráficos), sem a interface. Todas dividem o mesmo
+#   cache de taxas (que deve fazer uma única busca para todas) e montam gráficos do matplotlib ao
+#   mesmo tempo; no fim, os gráficos estáticos são remontados sem concorrência e comparados.
+#
+# Relata a vazão (execuções por segundo), os percentis de latência de cada etapa, as requisições
+# feitas ao servidor falso (no total e por processo), os erros e a memória (RSS) dos processos.
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCHMARK_DIR)
+
+PAGES = ("custom", "piggybank", "fii")
+MODES = ("processes", "threads")
+PERCENTILES = (50, 90, 95, 99)
+
+# Modo threads: valores padrão dos campos da Renda Fixa que fill_custom não preenche
+CUSTOM_DEFAULTS = {'contribution': 0.0, 'cdb_rate': 100.0, 'lci_lca_rate': 85.0}
+
+sys.path.insert(0, ROOT_DIR)
+
+# Memória residente atual do processo, em bytes
+def current_rss():
+    with open("/proc/self/statm") as file:
+        return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+# Maior memória residente do processo até agora, em bytes (ru_maxrss vem em KB no Linux)
+def peak_rss():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+# Percentil p (0 a 100) de uma lista de tempos, com interpolação linear
+def percentile(values, p):
+    values = sorted(values)
+    position = (len(values) - 1) * p / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+# Resumo dos tempos de uma etapa
+def latency_summary(timings):
+    summary = {'runs': len(timings), 'mean': sum(timings) / len(timings), 'max': max(timings)}
+    summary.update({f'p{p}': percentile(timings, p) for p in PERCENTILES})
+    return summary
+
+# Entradas de uma sessão; sessões com o mesmo cenário (de 0 a scenarios - 1) usam as mesmas entradas
+def session_inputs(scenario):
+    rng = random.Random(scenario)
+    return {
+        'custom': {'years': rng.randint(1, 50), 'investment': rng.choice((1000.0, 5000.0, 20000.0)),
+                   'daily': rng.random() < 0.3},
+        'piggybank': {'initial': rng.choice((500.0, 1000.0, 10000.0)), 'contribution': rng.choice((0.0, 100.0, 500.0)),
+                      'years': rng.randint(1, 30)},
+        'fii': {'funds': [(rng.uniform(6, 14), rng.uniform(8, 120), rng.randint(1, 200), rng.randint(0, 5))
+                          for _ in range(rng.randint(1, 3))],
+                'months': rng.randint(12, 240), 'interactive': rng.random() < 0.5},
+    }
+
+def _page(name):
+    from streamlit.testing.v1 import AppTest
+
+    return AppTest.from_file(os.path.join(ROOT_DIR, "pages", f"{name}.py"), default_timeout=300)
+
+def _widget(widgets, label):
+    for widget in widgets:
+        if widget.label.startswith(label):
+            return widget
+    raise LookupError(f"campo '{label}' não encontrado na página")
+
+# Preenche as entradas de cada página e clica em simular (o app já passou pela carga inicial)
+def fill_custom(app, inputs):
+    _widget(app.selectbox, "Unidade de Tempo").select("Anos").run()
+    _widget(app.number_input, "Investimento Inicial").set_value(inputs['investment'])
+    _widget(app.number_input, "Vencimento").set_value(inputs['years'])
+    app.toggle[0].set_value(inputs['daily'])
+    return _widget(app.button, "Simular")
+
+def fill_piggybank(app, inputs):
+    _widget(app.selectbox, "Unidade de Tempo").select("Anos").run()
+    _widget(app.number_input, "Valor Inicial").set_value(inputs['initial'])
+    _widget(app.number_input, "Contribuição Mensal").set_value(inputs['contribution'])
+    _widget(app.number_input, "Tempo de Investimento").set_value(inputs['years'])
+    return _widget(app.button, "Calcular")
+
+def fill_fii(app, inputs):
+    app.number_input[0].set_value(len(inputs['funds'])).run()
+    for i, (dy, price, shares, monthly) in enumerate(inputs['funds']):
+        app.text_input(key=f"ticker_{i}").input(f"FII{i}11")
+        app.number_input(key=f"dy_{i}").set_value(round(dy, 2))
+        app.number_input(key=f"price_{i}").set_value(round(price, 2))
+        app.number_input(key=f"shares_{i}").set_value(shares)
+        app.number_input(key=f"monthly_shares_{i}").set_value(monthly)
+    _widget(app.number_input, "Digite a quantidade de meses").set_value(inputs['months'])
+    app.toggle[0].set_value(inputs['interactive'])
+    app.run()
+    return _widget(app.button, "Simular")
+
+FILL = {'custom': fill_custom, 'piggybank': fill_piggybank, 'fii': fill_fii}
+
+# Erros mostrados por uma execução: exceções da página e mensagens st.error
+def _errors(app):
+    return [exception.value for exception in app.exception] + [error.value for error in app.error]
+
+# Uma sessão: abre cada página e simula; devolve os tempos [(página, etapa, segundos), ...] e os erros
+def run_session(scenario, pages):
+    inputs = session_inputs(scenario)
+    timings, errors = [], []
+    for name in pages:
+        start = time.perf_counter()
+        app = _page(name).run()
+        timings.append((name, 'load', time.perf_counter() - start))
+        errors += [f"{name}.load: {error}" for error in _errors(app)]
+
+        button = FILL[name](app, inputs[name])
+        start = time.perf_counter()
+        button.click().run()
+        timings.append((name, 'simulate', time.perf_counter() - start))
+        errors += [f"{name}.simulate: {error}" for error in _errors(app)]
+    return timings, errors
+
+# Preparação de cada processo: as bibliotecas pesadas são importadas antes da primeira sessão, para
+# as latências e o crescimento da memória refletirem só as sessões
+def _start_worker(url):
+    from streamlit import logger
+    from investdata import bcb
+    from investdata.warmup import prewarm
+
+    # Sem os avisos do AppTest rodando fora de um servidor (a variável de ambiente vale quando o
+    # AppTest lê a configuração; antes disso, só o nível definido direto)
+    os.environ["STREAMLIT_LOGGER_LEVEL"] = "error"
+    logger.set_log_level("error")
+
+    bcb.BCB_BASE_URL = url
+    prewarm(rates=False)
+
+# Roda uma sessão num processo de trabalho e devolve o que ela mediu, junto com o estado do processo
+def _session_task(index, scenario, pages):
+    from investdata import instrumentation
+
+    rss_before = current_rss()
+    started = time.monotonic()
+    try:
+        timings, errors = run_session(scenario, pages)
+    except Exception as error:  # uma sessão que quebra conta como erro e não derruba as outras
+        timings, errors = [], [f"sessão {index}: {type(error).__name__}: {error}"]
+    return {
+        'pid': os.getpid(),
+        'started': started,
+        'finished': time.monotonic(),
+        'timings': timings,
+        'errors': errors,
+        'rss_growth': current_rss() - rss_before,
+        'rss_peak': peak_rss(),
+        'counters': instrumentation.snapshot()[1],
+    }
+
+# Modo threads: o que cada página calcula e monta, chamando as mesmas funções que ela chama
+
+def build_custom(inputs, rates):
+    from investdata.fixed_income_simulation import build_simulation
+
+    return build_simulation(inputs['investment'], CUSTOM_DEFAULTS['contribution'], inputs['years'] * 12,
+                            CUSTOM_DEFAULTS['cdb_rate'], CUSTOM_DEFAULTS['lci_lca_rate'], rates['cdi'], rates['selic'],
+                            rates['tr'], inputs['daily'])
+
+def build_piggybank(inputs, rates):
+    from investdata.piggybank import calcular_cdi
+
+    return calcular_cdi(rates['cdi'], inputs['initial'], inputs['years'], inputs['contribution'], "Anos", 1.0)
+
+def build_fii(inputs):
+    from investdata.fii_charts import finishFigure, plotInvestmentGraph, plotProfitGraph
+    from investdata.incremental import extend_funds
+
+    funds = [(round(dy, 2) / 100, round(price, 2), shares, monthly) for dy, price, shares, monthly in inputs['funds']]
+    labels = [f"FII{i}11" for i in range(len(funds))]
+    months, interactive = inputs['months'], inputs['interactive']
+    _, profit, monthly, investment, _ = extend_funds([], funds, months)
+    return (finishFigure(plotProfitGraph(profit, monthly, months, labels, interactive), interactive),
+            finishFigure(plotInvestmentGraph(investment, months, labels, interactive), interactive))
+
+# Uma sessão do modo threads: busca as taxas e simula cada página pelo cache de resultados
+# Devolve os tempos [(página, etapa, segundos), ...] e os gráficos estáticos do FII, para a conferência
+def run_thread_session(scenario, pages):
+    from investdata import rate_service, result_cache
+
+    inputs = session_inputs(scenario)
+    timings = []
+    start = time.perf_counter()
+    rates, _ = rate_service.get_rates(('cdi', 'selic', 'tr'))
+    timings.append(('rates', 'get_rates', time.perf_counter() - start))
+
+    builds = {
+        'custom': lambda: build_custom(inputs['custom'], rates),
+        'piggybank': lambda: build_piggybank(inputs['piggybank'], rates),
+        'fii': lambda: build_fii(inputs['fii']),
+    }
+    charts = None
+    for name in pages:
+        start = time.perf_counter()
+        result = result_cache.get_or_compute(f'loadtest.{name}', inputs[name], rates if name != 'fii' else {}, builds[name])
+        timings.append((name, 'simulate', time.perf_counter() - start))
+        if name == 'fii' and not inputs['fii']['interactive']:
+            charts = result
+    return timings, charts
+
+# Roda sessions sessões em concurrency threads deste processo e devolve o relatório
+def load_test_threads(stub, sessions, concurrency, pages=PAGES, scenarios=0, warm=False):
+    from investdata import bcb, instrumentation, rate_service, result_cache
+    from investdata.warmup import prewarm
+
+    os.environ["INVESTDATA_BCB_URL"] = stub.url
+    os.environ["INVESTDATA_RATE_DB"] = os.path.join(tempfile.mkdtemp(), "rates.sqlite")
+    bcb.BCB_BASE_URL = stub.url
+    prewarm(rates=False)
+    rate_service.clear()
+    result_cache.clear()
+    if warm:
+        rate_service.get_rates()
+    instrumentation.reset()
+
+    upstream_before = stub.requests
+    series_before = dict(stub.series_requests)
+    gate = threading.Event()  # as sessões da primeira leva começam juntas, com o cache frio
+    charts = {}  # cenário -> gráficos estáticos do FII recebidos pelas sessões
+
+    def session(index):
+        scenario = index % scenarios if scenarios else index
+        gate.wait()
+        started = time.monotonic()
+        try:
+            timings, session_charts = run_thread_session(scenario, pages)
+            errors = []
+        except Exception as error:  # uma sessão que quebra conta como erro e não derruba as outras
+            timings, session_charts, errors = [], None, [f"sessão {index}: {type(error).__name__}: {error}"]
+        if session_charts is not None:
+            charts.setdefault(scenario, []).append(session_charts)
+        return {'pid': os.getpid(), 'started': started, 'finished': time.monotonic(), 'timings': timings,
+                'errors': errors, 'rss_peak': peak_rss(), 'counters': {}}
+
+    rss_before = current_rss()
+    with ThreadPoolExecutor(concurrency) as executor:
+        futures = [executor.submit(session, index) for index in range(sessions)]
+        gate.set()
+        results = [future.result() for future in as_completed(futures)]
+    rss_growth = (current_rss() - rss_before) / sessions
+    results[-1]['counters'] = instrumentation.snapshot()[1]
+
+    # Os gráficos montados com várias sessões ao mesmo tempo precisam ser iguais aos montados sem concorrência
+    for scenario, received in sorted(charts.items()):
+        expected = build_fii(session_inputs(scenario)['fii'])
+        if any(images != expected for images in received):
+            results[-1]['errors'].append(f"fii: gráfico do cenário {scenario} diferente do montado sem concorrência")
+
+    return _report(stub, upstream_before, series_before, results, sessions, concurrency, pages, rss_growth)
+
+# Roda sessions sessões, até concurrency ao mesmo tempo, e devolve o relatório
+# scenarios: quantidade de entradas diferentes sorteadas (0: uma por sessão), para exercitar o cache
+# de resultados; warm: salva as taxas no armazenamento local antes de começar
+def load_test(stub, sessions, concurrency, pages=PAGES, scenarios=0, warm=False):
+    os.environ["INVESTDATA_BCB_URL"] = stub.url
+    os.environ["INVESTDATA_RATE_DB"] = os.path.join(tempfile.mkdtemp(), "rates.sqlite")
+    if warm:
+        from investdata import bcb, rate_service
+
+        bcb.BCB_BASE_URL = stub.url
+        rate_service.clear()
+        rate_service.get_rates()
+
+    upstream_before = stub.requests
+    series_before = dict(stub.series_requests)
+
+    results = []
+    context = multiprocessing.get_context("spawn")  # processos novos, sem nada herdado deste
+    with ProcessPoolExecutor(concurrency, mp_context=context, initializer=_start_worker, initargs=(stub.url,)) as executor:
+        futures = [executor.submit(_session_task, index, index % scenarios if scenarios else index, tuple(pages))
+                   for index in range(sessions)]
+        for future in as_completed(futures):
+            results.append(future.result())
+
+    rss_growth = sum(result['rss_growth'] for result in results) / len(results)
+    return _report(stub, upstream_before, series_before, results, sessions, concurrency, pages, rss_growth)
+
+# Relatório a partir do que cada sessão mediu: tempos, erros e o estado do processo em que rodou
+def _report(stub, upstream_before, series_before, results, sessions, concurrency, pages, rss_growth):
+    # Vazão entre o início da primeira sessão e o fim da última (a partida dos processos fica de fora)
+    elapsed = max(result['finished'] for result in results) - min(result['started'] for result in results)
+    timings = {}  # (página, etapa) -> [segundos, ...]
+    for result in results:
+        for page, stage, seconds in result['timings']:
+            timings.setdefault((page, stage), []).append(seconds)
+    runs = sum(len(values) for values in timings.values())
+
+    # Estado mais recente de cada processo: pico de memória e contadores acumulados
+    workers = {}
+    for result in sorted(results, key=lambda result: result['finished']):
+        workers.setdefault(result['pid'], {}).update(
+            {key: value for key, value in result.items() if key != 'counters' or value})
+    counters = {}
+    for worker in workers.values():
+        for event, value in worker.get('counters', {}).items():
+            counters[event] = counters.get(event, 0) + value
+    peaks = [worker['rss_peak'] for worker in workers.values()]
+
+    return {
+        'sessions': sessions,
+        'concurrency': concurrency,
+        'pages': list(pages),
+        'elapsed': elapsed,
+        'throughput': {'page_runs_per_second': runs / elapsed, 'sessions_per_second': sessions / elapsed},
+        'latency': {f"{page}.{stage}": latency_summary(values) for (page, stage), values in sorted(timings.items())},
+        'all_runs': latency_summary([value for values in timings.values() for value in values]),
+        'upstream': {
+            'requests': stub.requests - upstream_before,
+            'by_series': {str(code): count - series_before.get(code, 0)
+                          for code, count in sorted(stub.series_requests.items(), key=str)
+                          if count > series_before.get(code, 0)},
+            # Requisições feitas por cada processo (contador bcb_request da instrumentação)
+            'per_process': {str(pid): worker.get('counters', {}).get('bcb_request', 0) for pid, worker in workers.items()},
+        },
+        'memory': {
+            'workers': len(workers),
+            'rss_peak_per_worker': max(peaks),
+            'rss_peak_total': sum(peaks),
+            'rss_growth_per_session': rss_growth,
+        },
+        'counters': counters,
+        'errors': [error for result in results for error in result['errors']],
+    }
+
+def _mb(value):
+    return f"{value / 2 ** 20:.1f} MB"
+
+# Relatório legível do resultado de load_test
+def print_report(report, stub):
+    print(f"\n{report['sessions']} sessões, {report['concurrency']} simultâneas, "
+          f"latência da API {stub.latency * 1000:.0f}ms, falhas {stub.failure_rate:.0%}")
+    print(f"tempo total {report['elapsed']:.2f}s; vazão {report['throughput']['page_runs_per_second']:.2f} execuções/s "
+          f"({report['throughput']['sessions_per_second']:.2f} sessões/s)")
+
+    header = ''.join(f"{f'p{p}':>10}" for p in PERCENTILES)
+    print(f"\n{'etapa':<24}{'execuções':>10}{header}{'máximo':>10}")
+    for name, summary in [*report['latency'].items(), ('todas', report['all_runs'])]:
+        values = ''.join(f"{summary[f'p{p}'] * 1000:>8.0f}ms" for p in PERCENTILES)
+        print(f"{name:<24}{summary['runs']:>10}{values}{summary['max'] * 1000:>8.0f}ms")
+
+    upstream = report['upstream']
+    print(f"\nrequisições ao servidor falso: {upstream['requests']} {upstream['by_series']}")
+    per_process = list(upstream['per_process'].values())
+    print(f"requisições por processo: {per_process} (média {sum(per_process) / len(per_process):.1f})")
+    counters = report['counters']
+    print("cache de resultados: " + ", ".join(f"{event.removeprefix('result_cache_')} {counters.get(event, 0)}"
+                                             for event in ('result_cache_hit', 'result_cache_miss', 'result_cache_evict')))
+
+    memory = report['memory']
+    print(f"memória: pico {_mb(memory['rss_peak_per_worker'])} por processo, {_mb(memory['rss_peak_total'])} somando "
+          f"os {memory['workers']} processos; {_mb(memory['rss_growth_per_session'])} a mais por sessão")
+
+    if report['errors']:
+        print(f"\n{len(report['errors'])} erro(s):")
+        for error in report['errors'][:10]:
+            print(f"  {error}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Teste de carga do InvestData com sessões simultâneas")
+    parser.add_argument("--sessions", type=int, default=16, help="quantidade de sessões simuladas")
+    parser.add_argument("--mode", choices=MODES, default="processes",
+                        help="processes: páginas pelo AppTest, um processo por sessão simultânea; threads: sessões em "
+                             "threads de um único processo, sem a interface")
+    parser.add_argument("--concurrency", type=int, default=4, help="sessões rodando ao mesmo tempo")
+    parser.add_argument("--page", choices=PAGES, action="append", help="página a simular (pode repetir; padrão: todas)")
+    parser.add_argument("--scenarios", type=int, default=0,
+                        help="quantidade de entradas diferentes sorteadas entre as sessões (0: uma por sessão)")
+    parser.add_argument("--latency", type=float, default=0.05, help="latência (segundos) de cada resposta da API falsa")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fração das requisições à API falsa que falham")
+    parser.add_argument("--seed", type=int, default=0, help="semente das falhas da API falsa")
+    parser.add_argument("--warm", action="store_true", help="busca as taxas antes de começar (cache morno)")
+    parser.add_argument("--output", help="arquivo JSON com o relatório")
+    args = parser.parse_args(argv)
+
+    from benchmarks.bcb_stub import StubBCBServer
+
+    with StubBCBServer(latency=args.latency, failure_rate=args.failure_rate, seed=args.seed) as stub:
+        run = load_test_threads if args.mode == "threads" else load_test
+        report = run(stub, args.sessions, args.concurrency, args.page or PAGES, args.scenarios, args.warm)
+        print_report(report, stub)
+
+    if args.output:
+        report.update({'python': platform.python_version(), 'platform': platform.platform(),
+                       'created_at': time.strftime("%Y-%m-%dT%H:%M:%S"),
+                       'mode': args.mode, 'stub': {'latency': args.latency, 'failure_rate': args.failure_rate}})
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    return 1 if report['errors'] else 0
+
+if __name__ == "__main__":
+    # Roda pelo módulo importado, para as funções enviadas aos processos serem encontradas pelo nome
+    # (o AppTest troca o __main__ dos processos pelo script da página)
+    from benchmarks.loadtest import main
+    sys.exit(main())
@@ -0,0 +1,298 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Benchmarks das calculadoras, da busca de taxas e das páginas do Streamlit
+#
+#   python -m benchmarks.run                       # roda tudo e compara com benchmarks/baseline.json
+#   python -m benchmarks.run --suite calculators   # só um grupo (calculators, rates, pages ou startup)
+#   python -m benchmarks.run --save-baseline       # grava o resultado atual como nova referência
+#
+# Os resultados vão para benchmarks/results.json. Um benchmark cuja mediana piorar mais que a
+# tolerância em relação à referência é reportado como regressão e o comando termina com código 1.
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCHMARK_DIR)
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, "baseline.json")
+RESULTS_PATH = os.path.join(BENCHMARK_DIR, "results.json")
+
+# Prazos (em meses) usados nos benchmarks das calculadoras, latência do servidor falso e tolerância padrão
+HORIZONS = (12, 120, 600)
+STUB_LATENCY = 0.05
+TOLERANCE = 0.25
+
+SUITES = ("calculators", "rates", "pages", "startup")
+
+# Duração mínima de cada amostra: funções rápidas são chamadas várias vezes por amostra
+MIN_SAMPLE_TIME = 0.02
+
+sys.path.insert(0, ROOT_DIR)
+
+# Tempo de number chamadas seguidas da função
+def _sample(func, number):
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return time.perf_counter() - start
+
+# Resumo de uma lista de tempos
+def summarize(timings, number=1):
+    return {
+        'runs': len(timings),
+        'number': number,
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.fmean(timings),
+    }
+
+# Mede uma função: uma execução de aquecimento (que também define quantas chamadas cabem numa
+# amostra de MIN_SAMPLE_TIME) e depois repeat amostras; os tempos são por chamada
+def measure(func, repeat):
+    number = max(1, int(MIN_SAMPLE_TIME / max(_sample(func, 1), 1e-9)))
+    timings = [_sample(func, number) / number for _ in range(repeat)]
+    return summarize(timings, number)
+
+# Calculadoras escalares (como eram chamadas mês a mês pelas páginas) e as versões vetorizadas
+def calculators_suite(record, repeat):
+    from investdata.fii import calculateProfit, calculateProfitBatch
+    from investdata.fixed_income import calculate_cdb, calculate_lci_lca, calculate_savings, project_fixed_income
+    from investdata.piggybank import calcular_cdi, valor_cofrinho
+    import numpy as np
+
+    funds = [(10.0 + i, 0.10 + i / 100, 100 + i, 2) for i in range(10)]
+    for months in HORIZONS:
+        def scalar_fixed_income():
+            for month in range(months + 1):
+                calculate_cdb(1000.0, 100.0, 11.5, month / 12, 100.0)
+                calculate_lci_lca(1000.0, 85.0, 11.5, month / 12, 100.0)
+                calculate_savings(1000.0, 10.5, month / 12, 100.0, 0.0744)
+
+        def scalar_calcular_cdi():
+            for month in range(months + 1):
+                calcular_cdi(11.5, 1000.0, month, 100.0, "Meses", 1.02)
+
+        def scalar_fii():
+            for price, dy, shares, monthly in funds:
+                calculateProfit(price, dy, shares, monthly, months)
+
+        record(f"calculators.fixed_income_scalar.{months}", scalar_fixed_income, repeat)
+        record(f"calculators.fixed_income_vectorized.{months}",
+               lambda: project_fixed_income(1000.0, 100.0, months, 100.0, 85.0, 11.5, 10.5, 0.0744), repeat)
+        record(f"calculators.calcular_cdi_scalar.{months}", scalar_calcular_cdi, repeat)
+        record(f"calculators.calcular_cdi_vectorized.{months}",
+               lambda: valor_cofrinho(11.5, 1000.0, np.arange(months + 1), 100.0, 1.02), repeat)
+        record(f"calculators.calculateProfit.{months}", scalar_fii, repeat)
+        record(f"calculators.calculateProfitBatch.{months}",
+               lambda: calculateProfitBatch(*zip(*[(price, dy, shares, monthly) for price, dy, shares, monthly in funds]), months), repeat)
+
+# Busca de taxas contra o servidor falso: fria (sem nada salvo), morna (só o armazenamento local) e quente (em memória)
+def rates_suite(record, repeat, stub):
+    from investdata import rate_service
+
+    def cold():
+        os.environ["INVESTDATA_RATE_DB"] = os.path.join(tempfile.mkdtemp(), "rates.sqlite")
+        rate_service.clear()
+        rate_service.get_rates()
+
+    def warm_store():
+        rate_service.clear()
+        rate_service.get_rates()
+
+    before = stub.requests
+    record("rates.cold", cold, repeat)
+    record("rates.warm_store", warm_store, repeat)
+    record("rates.warm_memory", rate_service.get_rates, repeat)
+    print(f"  requisições ao servidor falso: {stub.requests - before}")
+
+# Execução completa das páginas pelo AppTest do Streamlit: carga inicial e clique em simular
+def pages_suite(record, repeat):
+    from streamlit.testing.v1 import AppTest
+    from investdata import result_cache
+
+    def page(name):
+        return AppTest.from_file(os.path.join(ROOT_DIR, "pages", name), default_timeout=120)
+
+    # Campo pelo começo do rótulo (a ordem dos campos na árvore não segue a ordem do código)
+    def widget(widgets, label):
+        return next(widget for widget in widgets if widget.label.startswith(label))
+
+    def custom():
+        app = page("custom.py").run()
+        # Trocar a unidade muda o rótulo do vencimento, então a página roda antes de preenchê-lo
+        widget(app.selectbox, "Unidade de Tempo").select("Anos").run()
+        widget(app.number_input, "Vencimento").set_value(50)
+        app.button[0].click().run()
+
+    def piggybank():
+        app = page("piggybank.py").run()
+        app.number_input[0].set_value(1000.0)
+        app.button[0].click().run()
+
+    def fii():
+        app = page("fii.py").run()
+        app.number_input[0].set_value(3).run()
+        for i in range(3):
+            app.text_input(key=f"ticker_{i}").input(f"FII{i}11")
+            app.number_input(key=f"dy_{i}").set_value(10.0 + i)
+            app.number_input(key=f"price_{i}").set_value(100.0)
+            app.number_input(key=f"shares_{i}").set_value(10)
+        app.number_input[-1].set_value(120)
+        app.run()
+        app.button[0].click().run()
+
+    # O cache de resultados é do processo e sobrevive entre as execuções do AppTest: cada execução
+    # medida começa com ele vazio, para cobrir o cálculo e a montagem dos gráficos
+    def uncached(func):
+        def run():
+            result_cache.clear()
+            func()
+        return run
+
+    # A página inicial usa st.page_link, que exige a navegação definida em streamlit_app.py
+    record("pages.home", lambda: AppTest.from_file(os.path.join(ROOT_DIR, "streamlit_app.py"), default_timeout=120).run(), repeat)
+    record("pages.custom", uncached(custom), repeat)
+    record("pages.piggybank", uncached(piggybank), repeat)
+    record("pages.fii", uncached(fii), repeat)
+
+    # Mesmas entradas de outra sessão: a execução de aquecimento guarda o resultado e as medidas são acertos do cache
+    result_cache.clear()
+    record("pages.custom.cached", custom, repeat)
+    record("pages.fii.cached", fii, repeat)
+
+# Primeira execução de uma página num processo novo (tempo até a primeira pintura)
+# O processo importa o AppTest (e com ele o Streamlit) antes de começar a medir; com prewarm=True,
+# também roda investdata.warmup.prewarm() antes, como faria um worker com INVESTDATA_PREWARM=1
+STARTUP_SCRIPT = """
+import sys, time
+from streamlit.testing.v1 import AppTest
+if sys.argv[2] == "1":
+    from investdata.warmup import prewarm
+    prewarm()
+start = time.perf_counter()
+AppTest.from_file(sys.argv[1], default_timeout=120).run()
+print(time.perf_counter() - start)
+"""
+
+# Páginas medidas na partida (a inicial pelo streamlit_app.py, por causa do st.page_link)
+STARTUP_PAGES = {
+    'home': "streamlit_app.py",
+    'custom': os.path.join("pages", "custom.py"),
+    'piggybank': os.path.join("pages", "piggybank.py"),
+    'fii': os.path.join("pages", "fii.py"),
+    'sweep': os.path.join("pages", "sweep.py"),
+    'montecarlo': os.path.join("pages", "montecarlo.py"),
+    'backtest': os.path.join("pages", "backtest.py"),
+}
+
+def _first_paint(path, prewarm):
+    output = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT, path, "1" if prewarm else "0"], cwd=ROOT_DIR,
+                            capture_output=True, text=True, check=True).stdout
+    return float(output.split()[-1])
+
+# Tempo até a primeira pintura de cada página num processo recém-iniciado, sem e com pré-aquecimento
+# As taxas e os históricos diários já ficam salvos localmente antes, como num worker em produção
+def startup_suite(store, repeat):
+    from investdata import rate_service
+    from investdata.backtest import update_history
+
+    rate_service.get_rates()
+    update_history('cdi_daily')
+    update_history('tr_daily')
+    for name, path in STARTUP_PAGES.items():
+        store(f"startup.{name}", summarize([_first_paint(path, False) for _ in range(repeat)]))
+        store(f"startup.{name}.prewarmed", summarize([_first_paint(path, True) for _ in range(repeat)]))
+
+# Compara os resultados com a referência; retorna a lista de regressões
+def compare(results, baseline, tolerance):
+    regressions = []
+    print(f"\n{'benchmark':<50} {'mediana':>12} {'referência':>12} {'variação':>10}")
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            print(f"{name:<50} {result['median'] * 1000:>10.3f}ms {'-':>12} {'novo':>10}")
+            continue
+        change = result['median'] / reference['median'] - 1
+        status = " REGRESSÃO" if change > tolerance else ""
+        print(f"{name:<50} {result['median'] * 1000:>10.3f}ms {reference['median'] * 1000:>10.3f}ms {change:>+9.1%}{status}")
+        if change > tolerance:
+            regressions.append(name)
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks do InvestData")
+    parser.add_argument("--suite", choices=SUITES, action="append",
+                        help="grupo a rodar (pode repetir; padrão: todos)")
+    parser.add_argument("--repeat", type=int, default=5, help="execuções cronometradas por benchmark")
+    parser.add_argument("--output", default=RESULTS_PATH, help="arquivo JSON com os resultados")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="arquivo JSON de referência")
+    parser.add_argument("--save-baseline", action="store_true", help="grava os resultados como nova referência")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="piora máxima aceita da mediana (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+    suites = args.suite or list(SUITES)
+
+    from benchmarks.bcb_stub import StubBCBServer
+
+    results = {}
+
+    def store(name, result):
+        results[name] = result
+        print(f"  {name}: mediana {result['median'] * 1000:.3f}ms")
+
+    def record(name, func, repeat):
+        store(name, measure(func, repeat))
+
+    # Todas as chamadas à API vão para o servidor falso, com um armazenamento local temporário
+    with StubBCBServer(latency=STUB_LATENCY) as stub:
+        os.environ["INVESTDATA_BCB_URL"] = stub.url
+        os.environ["INVESTDATA_RATE_DB"] = os.path.join(tempfile.mkdtemp(), "rates.sqlite")
+        from investdata import bcb
+        bcb.BCB_BASE_URL = stub.url
+
+        for suite in suites:
+            print(f"[{suite}]")
+            if suite == "calculators":
+                calculators_suite(record, args.repeat)
+            elif suite == "rates":
+                rates_suite(record, args.repeat, stub)
+            elif suite == "pages":
+                pages_suite(record, args.repeat)
+            else:
+                startup_suite(store, args.repeat)
+
+    output = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpus': os.cpu_count(),
+        'created_at': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'results': results,
+    }
+    with open(args.output, "w") as file:
+        json.dump(output, file, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as file:
+            json.dump(output, file, indent=2)
+        print(f"\nReferência gravada em {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nSem referência em {args.baseline}; rode com --save-baseline para criar uma.")
+        return 0
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)['results']
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regressão(ões) acima de {args.tolerance:.0%}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+# Núcleo de cálculo do InvestData, importável sem a interface do Streamlit
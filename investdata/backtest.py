@@ -0,0 +1,97 @@
+import functools
+
+import numpy as np
+
+from investdata import bcb, rate_store
+from investdata.fixed_income import ir_rate_days
+
+# Backtest histórico com as taxas diárias reais do Banco Central
+# Para cada série diária é montado um índice de acumulação: index[k] é o produto dos fatores
+# diários (1 + % do CDI * taxa do dia) de todos os dias úteis anteriores ao k-ésimo. Assim o
+# rendimento entre quaisquer duas datas é index[fim] / index[início], sem recompor dia a dia,
+# e uma carteira com aportes custa uma divisão por aporte.
+
+class AccrualIndex:
+    # dates: dias com taxa divulgada (datetime64[D]); rates: taxas diárias em %; multiplier: fração da taxa (1.1 = 110%)
+    def __init__(self, dates, rates, multiplier=1.0):
+        self.dates = np.asarray(dates, dtype='datetime64[D]')
+        self.multiplier = multiplier
+        factors = 1 + multiplier * np.asarray(rates, dtype=float) / 100
+        self.index = np.concatenate([[1.0], np.cumprod(factors)])
+
+        # Posição no índice de cada dia corrido entre o primeiro e o último dia (mais um),
+        # para transformar uma data em posição em O(1), sem busca binária
+        self.first_day = self.dates[0]
+        calendar = np.arange(self.dates[0], self.dates[-1] + 2)
+        self._positions = np.searchsorted(self.dates, calendar, side='left')
+
+    # Posição no índice de cada data: quantidade de dias com taxa antes dela
+    def position(self, dates):
+        offsets = (np.asarray(dates, dtype='datetime64[D]') - self.first_day).astype(np.int64)
+        return self._positions[np.clip(offsets, 0, len(self._positions) - 1)]
+
+    # Fator de rendimento de um valor aplicado em start e resgatado em end
+    # (rende todos os dias úteis d com start <= d < end); aceita arrays de datas
+    def factor(self, start, end):
+        return self.index[self.position(end)] / self.index[self.position(start)]
+
+# Índice já montado para uma série diária, reaproveitado enquanto a série salva não mudar
+@functools.lru_cache(maxsize=32)
+def _build_index(code, multiplier, updated_at):
+    points = rate_store.load_points(code)
+    if not points:
+        raise ValueError(f"a série {code} ainda não foi salva localmente")
+    dates, rates = zip(*points)
+    return AccrualIndex(np.array(dates, dtype='datetime64[D]'), rates, multiplier)
+
+# Atualiza a série diária no armazenamento local (baixando o histórico completo na primeira vez)
+def update_history(name):
+    series = bcb.DAILY_SERIES[name]
+    bcb.update_series(series['code'], first_date=series['first_date'])
+
+# Índice de acumulação de uma série diária ('cdi_daily' ou 'selic_daily') a um percentual dela
+def load_index(name, rate=100.0):
+    code = bcb.DAILY_SERIES[name]['code']
+    return _build_index(code, rate / 100, rate_store.updated_at(code))
+
+# Datas e valores dos aportes: o investimento inicial em start e um aporte a cada
+# frequency_months meses no mesmo dia do mês (ou no último dia, se o mês for mais curto), antes de end
+def contribution_schedule(start, end, initial_value, contribution_value, frequency_months=1):
+    start = np.datetime64(start, 'D')
+    end = np.datetime64(end, 'D')
+    months = np.arange(start.astype('datetime64[M]') + frequency_months, end.astype('datetime64[M]') + 1, frequency_months)
+    day = start - start.astype('datetime64[M]').astype('datetime64[D]')
+    dates = np.minimum(months.astype('datetime64[D]') + day, (months + 1).astype('datetime64[D]') - 1)
+    dates = dates[dates < end] if contribution_value else dates[:0]
+
+    all_dates = np.concatenate([[start], dates])
+    amounts = np.concatenate([[initial_value], np.full(len(dates), float(contribution_value))])
+    return all_dates, amounts
+
+# Valor de cada aporte (lote) na data end: bruto e, se taxed, líquido de IR conforme o prazo de cada lote
+def lot_values(index, dates, amounts, end, taxed=False):
+    dates = np.asarray(dates, dtype='datetime64[D]')
+    gross = amounts * index.factor(dates, end)
+    if not taxed:
+        return gross
+    days = (np.datetime64(end, 'D') - dates).astype(np.int64)
+    return gross - np.maximum(gross - amounts, 0) * ir_rate_days(days)
+
+# Resultado de um backtest entre start e end: valor final, total aportado e lucro
+def run_backtest(index, start, end, initial_value, contribution_value, taxed=False, frequency_months=1):
+    dates, amounts = contribution_schedule(start, end, initial_value, contribution_value, frequency_months)
+    final_value = float(lot_values(index, dates, amounts, end, taxed).sum())
+    invested = float(amounts.sum())
+    return {'final_value': final_value, 'invested': invested, 'profit': final_value - invested}
+
+# Valor da carteira em cada data de eval_dates (só entram os aportes feitos até a data)
+# Custo proporcional a aportes x datas avaliadas
+def value_curve(index, dates, amounts, eval_dates, taxed=False):
+    dates = np.asarray(dates, dtype='datetime64[D]')
+    eval_dates = np.asarray(eval_dates, dtype='datetime64[D]')
+    gross = amounts[:, None] * index.factor(dates[:, None], eval_dates[None, :])
+    values = gross
+    if taxed:
+        days = (eval_dates[None, :] - dates[:, None]).astype(np.int64)
+        values = gross - np.maximum(gross - amounts[:, None], 0) * ir_rate_days(days)
+    return np.where(dates[:, None] <= eval_dates[None, :], values, 0.0).sum(axis=0)
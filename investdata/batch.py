@@ -0,0 +1,225 @@
+import argparse
+import csv
+import json
+import sys
+from itertools import islice
+
+import numpy as np
+
+from investdata.fii import calculateFinalBatch
+from investdata.fixed_income import cdb_value, lci_lca_value, savings_value
+from investdata.piggybank import valor_cofrinho
+
+# Avaliação em lote de cenários, sem a interface do Streamlit
+# Lê cenários de um CSV ou JSONL (um por linha), avalia em blocos de batch_size com as funções
+# vetorizadas do núcleo e grava cada bloco assim que fica pronto, então a memória usada depende
+# só do tamanho do bloco, e não do tamanho do arquivo.
+#
+#   python -m investdata.batch renda_fixa cenarios.csv -o resultados.csv
+#   python -m investdata.batch cofrinho cenarios.jsonl --cdi 11.15 > resultados.jsonl
+#   python -m investdata.batch fii fundos.csv -o resultados.jsonl
+#
+# Colunas de entrada de cada tipo (as opcionais têm o valor padrão entre parênteses):
+#   renda_fixa: initial_value, months, cdb_rate, lci_lca_rate, contribution_value (0),
+#               cdi_rate, selic_rate e ref_rate (taxas atuais do Banco Central)
+#   cofrinho:   initial_value, months, contribution_value (0), cdi_percent (100), cdi_rate (taxa atual)
+#   fii:        price, dy, num_shares, months, monthly_shares (0)
+# Taxas e rentabilidades em %, prazos em meses inteiros. As colunas de entrada são repetidas na saída,
+# seguidas das colunas calculadas.
+
+BATCH_SIZE = 10_000
+
+# Tipos de cenário: colunas obrigatórias, colunas opcionais com o valor padrão
+# (None = taxa atual do Banco Central) e colunas calculadas
+KINDS = {
+    'renda_fixa': {
+        'required': ('initial_value', 'months', 'cdb_rate', 'lci_lca_rate'),
+        'optional': {'contribution_value': 0.0, 'cdi_rate': None, 'selic_rate': None, 'ref_rate': None},
+        'outputs': ('cdb_value', 'lci_lca_value', 'savings_value', 'best'),
+    },
+    'cofrinho': {
+        'required': ('initial_value', 'months'),
+        'optional': {'contribution_value': 0.0, 'cdi_percent': 100.0, 'cdi_rate': None},
+        'outputs': ('cofrinho_value',),
+    },
+    'fii': {
+        'required': ('price', 'dy', 'num_shares', 'months'),
+        'optional': {'monthly_shares': 0.0},
+        'outputs': ('profit', 'monthly_return', 'investment_value', 'total_shares'),
+    },
+}
+
+# Nome do produto de cada coluna de renda fixa, na ordem usada para escolher o melhor
+FIXED_INCOME_PRODUCTS = (('cdb_value', 'CDB'), ('lci_lca_value', 'LCI/LCA'), ('savings_value', 'Poupança'))
+
+# Taxas do Banco Central usadas nas colunas de taxa que não vierem no arquivo
+RATE_COLUMNS = {'cdi_rate': 'cdi', 'selic_rate': 'selic', 'ref_rate': 'tr'}
+
+# Formato a partir da extensão do arquivo ('-' é a entrada ou saída padrão, em CSV)
+def detect_format(path):
+    return 'jsonl' if str(path).lower().endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+
+# Lê os cenários um a um como dicionários, sem carregar o arquivo inteiro
+def read_scenarios(file, fmt):
+    if fmt == 'csv':
+        yield from csv.DictReader(file)
+        return
+    for line in file:
+        if line.strip():
+            yield json.loads(line)
+
+# Agrupa os cenários em listas de até size itens
+def batches(scenarios, size=BATCH_SIZE):
+    iterator = iter(scenarios)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+# Colunas de um bloco de cenários como arrays NumPy
+def _columns(kind, batch, rates):
+    spec = KINDS[kind]
+    columns = {}
+    for name in spec['required'] + tuple(spec['optional']):
+        default = spec['optional'].get(name)
+        if default is None and name in RATE_COLUMNS:
+            default = rates[RATE_COLUMNS[name]]
+        values = []
+        for position, scenario in enumerate(batch):
+            value = scenario.get(name)
+            if value is None or value == '':
+                if name in spec['required']:
+                    raise ValueError(f"cenário {position + 1} do bloco sem a coluna obrigatória '{name}'")
+                value = default
+            values.append(value)
+        columns[name] = np.asarray(values, dtype=float)
+
+    if np.any(columns['months'] < 0) or np.any(columns['months'] != np.trunc(columns['months'])):
+        raise ValueError("'months' precisa ser um número inteiro de meses, sem valores negativos")
+    columns['months'] = columns['months'].astype(int)
+    if 'price' in columns and np.any(columns['price'] <= 0):
+        raise ValueError("'price' precisa ser maior que zero")
+    return columns
+
+# Avalia um bloco de cenários de uma vez; retorna um dicionário coluna calculada -> array
+def evaluate_batch(kind, batch, rates=None):
+    columns = _columns(kind, batch, rates or {})
+
+    if kind == 'renda_fixa':
+        results = {
+            'cdb_value': cdb_value(columns['initial_value'], columns['cdb_rate'], columns['cdi_rate'],
+                                   columns['months'], columns['contribution_value']),
+            'lci_lca_value': lci_lca_value(columns['initial_value'], columns['lci_lca_rate'], columns['cdi_rate'],
+                                           columns['months'], columns['contribution_value']),
+            'savings_value': savings_value(columns['initial_value'], columns['selic_rate'], columns['months'],
+                                           columns['contribution_value'], columns['ref_rate']),
+        }
+        best = np.argmax(np.stack([results[column] for column, _ in FIXED_INCOME_PRODUCTS]), axis=0)
+        results['best'] = np.array([product for _, product in FIXED_INCOME_PRODUCTS])[best]
+        return results
+
+    if kind == 'cofrinho':
+        return {'cofrinho_value': valor_cofrinho(columns['cdi_rate'], columns['initial_value'], columns['months'],
+                                                 columns['contribution_value'], columns['cdi_percent'] / 100)}
+
+    profit, monthly_return, investment_value, total_shares = calculateFinalBatch(
+        columns['price'], columns['dy'] / 100, columns['num_shares'], columns['monthly_shares'], columns['months'])
+    return {'profit': profit, 'monthly_return': monthly_return, 'investment_value': investment_value,
+            'total_shares': total_shares}
+
+# Grava os resultados de um bloco, no formato da saída
+class _Writer:
+    def __init__(self, file, fmt, outputs):
+        self.file = file
+        self.fmt = fmt
+        self.outputs = outputs
+        self.csv = None
+
+    def write(self, batch, results):
+        columns = [results[name].tolist() for name in self.outputs]
+        if self.fmt == 'jsonl':
+            self.file.writelines(json.dumps({**scenario, **dict(zip(self.outputs, values))}, ensure_ascii=False) + "\n"
+                                 for scenario, values in zip(batch, zip(*columns)))
+        else:
+            if self.csv is None:
+                # O cabeçalho vem do primeiro cenário: as colunas de entrada e depois as calculadas
+                fields = [field for field in batch[0] if field not in self.outputs] + list(self.outputs)
+                self.csv = csv.DictWriter(self.file, fieldnames=fields, extrasaction='ignore')
+                self.csv.writeheader()
+            self.csv.writerows({**scenario, **dict(zip(self.outputs, values))}
+                               for scenario, values in zip(batch, zip(*columns)))
+        self.file.flush()
+
+# Taxas atuais (CDI, Selic e TR) direto da API, com as que vierem em overrides no lugar
+# Não usa o serviço de taxas das páginas: ele serviria os valores salvos (talvez antigos) e atualizaria
+# em segundo plano; aqui o armazenamento local é atualizado antes de o lote rodar
+def current_rates(kind, overrides=None):
+    overrides = {name: value for name, value in (overrides or {}).items() if value is not None}
+    needed = [RATE_COLUMNS[column] for column in KINDS[kind]['optional'] if column in RATE_COLUMNS]
+    missing = tuple(name for name in needed if name not in overrides)
+    if not missing:
+        return overrides, []
+
+    from investdata import bcb
+    rates, failed = bcb.fetch_rates(missing)
+    return {**rates, **overrides}, failed
+
+# Avalia todos os cenários de input_file e grava os resultados em output_file, bloco a bloco
+# Retorna a quantidade de cenários avaliados
+def run_batch(kind, input_file, output_file, rates=None, input_format='csv', output_format='csv',
+              batch_size=BATCH_SIZE):
+    writer = _Writer(output_file, output_format, KINDS[kind]['outputs'])
+    total = 0
+    for batch in batches(read_scenarios(input_file, input_format), batch_size):
+        try:
+            results = evaluate_batch(kind, batch, rates)
+        except ValueError as error:
+            raise ValueError(f"erro nos cenários {total + 1} a {total + len(batch)}: {error}") from error
+        writer.write(batch, results)
+        total += len(batch)
+    return total
+
+def _open(path, mode):
+    if path == '-':
+        return sys.stdin if mode == 'r' else sys.stdout
+    return open(path, mode, newline='', encoding='utf-8')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Avaliação em lote de cenários do InvestData")
+    parser.add_argument("kind", choices=tuple(KINDS), help="tipo de cenário")
+    parser.add_argument("input", help="arquivo CSV ou JSONL com um cenário por linha ('-' para a entrada padrão)")
+    parser.add_argument("-o", "--output", default='-', help="arquivo de saída (padrão: saída padrão)")
+    parser.add_argument("--input-format", choices=("csv", "jsonl"), help="formato da entrada (padrão: pela extensão)")
+    parser.add_argument("--output-format", choices=("csv", "jsonl"), help="formato da saída (padrão: pela extensão)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="cenários avaliados por bloco")
+    parser.add_argument("--cdi", type=float, help="CDI anual em %% (padrão: taxa atual do Banco Central)")
+    parser.add_argument("--selic", type=float, help="Selic anual em %% (padrão: taxa atual do Banco Central)")
+    parser.add_argument("--tr", type=float, help="TR mensal em %% (padrão: taxa atual do Banco Central)")
+    args = parser.parse_args(argv)
+
+    if args.batch_size < 1:
+        parser.error("--batch-size precisa ser positivo")
+
+    rates, failed = current_rates(args.kind, {'cdi': args.cdi, 'selic': args.selic, 'tr': args.tr})
+    if failed:
+        print(f"Erro ao obter taxas do Banco Central ({', '.join(failed)}); usando valores padrão.", file=sys.stderr)
+
+    input_file = _open(args.input, 'r')
+    output_file = _open(args.output, 'w')
+    try:
+        total = run_batch(args.kind, input_file, output_file, rates,
+                          input_format=args.input_format or detect_format(args.input),
+                          output_format=args.output_format or detect_format(args.output),
+                          batch_size=args.batch_size)
+    except (ValueError, KeyError, csv.Error) as error:
+        print(f"Erro: {error}", file=sys.stderr)
+        return 1
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+
+    print(f"{total} cenários avaliados", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
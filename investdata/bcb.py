@@ -0,0 +1,166 @@
+import datetime
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from investdata import instrumentation, rate_store
+
+# Cliente da API SGS do Banco Central
+# Todas as séries são pedidas em paralelo usando uma única sessão HTTP com pool de conexões.
+# Cada requisição tem seu próprio timeout e o conjunto todo tem um prazo total; a série que
+# falhar ou não responder a tempo usa o último valor salvo no armazenamento local
+# (investdata.rate_store) e, só se ainda não houver nada salvo, o seu valor padrão.
+# O requests só é importado quando a API é de fato chamada: com as taxas em memória ou salvas
+# localmente, as páginas abrem sem carregá-lo.
+
+# Endereço base da API (pode ser trocado por um servidor local em testes)
+BCB_BASE_URL = os.environ.get("INVESTDATA_BCB_URL", "https://api.bcb.gov.br/dados/serie")
+
+# Timeout de cada requisição (conexão, leitura) e prazo total da busca, em segundos
+REQUEST_TIMEOUT = (3.05, 5)
+TOTAL_DEADLINE = 8
+
+# Tempo (em segundos) em que uma série salva localmente é considerada atual e não é pedida à API
+STORE_MAX_AGE = 60 * 60
+
+# Séries usadas pelo app: código SGS, como reduzir a série a uma taxa e valor padrão
+# CDI e Selic: soma dos últimos doze meses (desconsiderando os meses mais recentes, ainda incompletos)
+# TR: último valor divulgado
+# A TR (226) é uma série diária, que a API não entrega sem intervalo de datas: com o armazenamento
+# vazio, só os últimos recent_days dias são pedidos, já que a taxa usa só o último valor
+SERIES = {
+    'cdi': {'code': 4391, 'reduce': lambda values: sum(values[-14:-2]), 'default': 11.5},
+    'selic': {'code': 4390, 'reduce': lambda values: sum(values[-13:-1]), 'default': 10.5},
+    'tr': {'code': 226, 'reduce': lambda values: values[-1], 'default': 0.0744, 'recent_days': 30},
+}
+
+# Séries diárias baixadas com todo o histórico (taxa em % ao dia), com a data do primeiro ponto:
+# CDI e Selic para o backtest e TR, desde o Plano Real, para a simulação de cenários
+# A API só aceita intervalos de até 10 anos para séries diárias, então o histórico é baixado em janelas
+DAILY_SERIES = {
+    'cdi_daily': {'code': 12, 'first_date': '1986-03-06'},
+    'selic_daily': {'code': 11, 'first_date': '1986-06-04'},
+    'tr_daily': {'code': 226, 'first_date': '1994-07-01'},
+}
+MAX_WINDOW_YEARS = 10
+
+_session = None
+_executor = ThreadPoolExecutor(max_workers=len(SERIES), thread_name_prefix="bcb")
+
+# Sessão HTTP compartilhada, criada na primeira chamada
+def get_session():
+    global _session
+    if _session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=len(SERIES), pool_maxsize=len(SERIES) * 2)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _session = session
+    return _session
+
+# Baixa uma série e devolve os pontos [(data ISO, valor), ...] em ordem cronológica
+# start_date e end_date (ISO) limitam a busca ao intervalo, usando os parâmetros dataInicial e dataFinal da API
+def fetch_series(code, start_date=None, base_url=None, timeout=REQUEST_TIMEOUT, end_date=None):
+    url = f"{base_url or BCB_BASE_URL}/bcdata.sgs.{code}/dados"
+    params = {'formato': 'json'}
+    if start_date is not None:
+        end_date = datetime.date.fromisoformat(end_date) if end_date else datetime.date.today()
+        params['dataInicial'] = datetime.date.fromisoformat(start_date).strftime('%d/%m/%Y')
+        params['dataFinal'] = end_date.strftime('%d/%m/%Y')
+    instrumentation.count('bcb_request')
+    response = get_session().get(url, params=params, timeout=timeout)
+    # A API responde 404 quando não há nenhum ponto no intervalo pedido
+    if start_date is not None and response.status_code == 404:
+        return []
+    response.raise_for_status()
+    return [
+        (datetime.datetime.strptime(entry['data'], '%d/%m/%Y').date().isoformat(), float(entry['valor']))
+        for entry in response.json()
+    ]
+
+# Atualiza a série no armazenamento local pedindo à API só as datas a partir do último ponto salvo
+# O último ponto é pedido de novo porque o valor do mês corrente ainda pode ser revisado
+# recent_days: para séries ainda vazias, pede só os últimos recent_days dias (séries diárias precisam de intervalo)
+# first_date: baixa o histórico inteiro a partir dessa data, em janelas de MAX_WINDOW_YEARS, enquanto ele ainda
+# não tiver sido baixado (a série pode ter só os pontos recentes, como a TR salva para a taxa)
+def update_series(code, base_url=None, timeout=REQUEST_TIMEOUT, max_age=None, first_date=None, recent_days=None):
+    max_age = STORE_MAX_AGE if max_age is None else max_age
+    history_start = rate_store.history_start(code)
+    if first_date is not None and (history_start is None or history_start > first_date):
+        start_date = first_date
+    else:
+        last_update = rate_store.updated_at(code)
+        if last_update is not None and time.time() - last_update < max_age:
+            instrumentation.count('rate_store_fresh')
+            return
+        start_date = rate_store.last_date(code)
+        if start_date is None and recent_days is not None:
+            start_date = (datetime.date.today() - datetime.timedelta(days=recent_days)).isoformat()
+    if start_date is None:
+        rows = fetch_series(code, base_url=base_url, timeout=timeout)
+    else:
+        rows = []
+        for window_start, window_end in _windows(datetime.date.fromisoformat(start_date), datetime.date.today()):
+            rows += fetch_series(code, start_date=window_start.isoformat(), end_date=window_end.isoformat(),
+                                 base_url=base_url, timeout=timeout)
+    # O histórico só conta como baixado quando a API devolveu algum ponto
+    rate_store.save_points(code, rows, history_start=first_date if first_date is not None and rows else None)
+
+# Divide o intervalo em janelas consecutivas de no máximo MAX_WINDOW_YEARS anos
+def _windows(start, end):
+    while start <= end:
+        try:
+            next_start = start.replace(year=start.year + MAX_WINDOW_YEARS)
+        except ValueError:  # 29 de fevereiro sem correspondente no ano final
+            next_start = start.replace(year=start.year + MAX_WINDOW_YEARS, day=28)
+        window_end = min(end, next_start - datetime.timedelta(days=1))
+        yield start, window_end
+        start = window_end + datetime.timedelta(days=1)
+
+# Reduz a série salva localmente à taxa usada pelo app
+def stored_rate(name):
+    series = SERIES[name]
+    values = rate_store.load_values(series['code'])
+    if not values:
+        raise ValueError(f"a série {series['code']} ainda não foi salva localmente")
+    return series['reduce'](values)
+
+# Atualiza a série (se possível) e a reduz à taxa usada pelo app
+# Se a API falhar, usa o último valor conhecido; o erro só é propagado se não houver nada salvo
+def fetch_rate(name, base_url=None, timeout=REQUEST_TIMEOUT):
+    import requests
+
+    try:
+        update_series(SERIES[name]['code'], base_url=base_url, timeout=timeout, recent_days=SERIES[name].get('recent_days'))
+    except (requests.RequestException, ValueError, KeyError):
+        if not rate_store.load_values(SERIES[name]['code']):
+            raise
+    return stored_rate(name)
+
+# Busca todas as taxas pedidas em paralelo
+# Retorna (taxas, falhas): taxas com o valor padrão aplicado para cada série sem nenhum
+# valor disponível e a lista com o nome dessas séries
+def fetch_rates(names=tuple(SERIES), base_url=None, timeout=REQUEST_TIMEOUT, deadline=TOTAL_DEADLINE):
+    import requests
+
+    futures = {name: _executor.submit(fetch_rate, name, base_url, timeout) for name in names}
+    wait(futures.values(), timeout=deadline)
+
+    rates = {}
+    failed = []
+    for name, future in futures.items():
+        try:
+            if future.done():
+                rates[name] = future.result()
+            else:
+                # Prazo total esgotado: usa o que já estiver salvo localmente
+                future.cancel()
+                rates[name] = stored_rate(name)
+        except (requests.RequestException, sqlite3.Error, ValueError, KeyError, IndexError):
+            rates[name] = SERIES[name]['default']
+            failed.append(name)
+    return rates, failed
@@ -0,0 +1,100 @@
+import functools
+
+import numpy as np
+
+# Calendário de dias úteis do Brasil (feriados nacionais, como no calendário da ANBIMA)
+# Os dias úteis de todo o intervalo do calendário ficam num bitmap (um bit por dia) e numa soma
+# acumulada, então a quantidade de dias úteis entre duas datas quaisquer sai de duas leituras
+# (O(1)), sem percorrer os dias; as funções aceitam arrays de datas.
+
+# Intervalo coberto pelo calendário padrão
+FIRST_DAY = '1990-01-01'
+LAST_DAY = '2100-12-31'
+
+# Feriados nacionais de data fixa (mês, dia) e desde quando valem
+FIXED_HOLIDAYS = (
+    ((1, 1), None),    # Confraternização Universal
+    ((4, 21), None),   # Tiradentes
+    ((5, 1), None),    # Dia do Trabalho
+    ((9, 7), None),    # Independência
+    ((10, 12), None),  # Nossa Senhora Aparecida
+    ((11, 2), None),   # Finados
+    ((11, 15), None),  # Proclamação da República
+    ((11, 20), 2024),  # Dia Nacional de Zumbi e da Consciência Negra (Lei 14.759/2023)
+    ((12, 25), None),  # Natal
+)
+
+# Feriados móveis, em dias a partir do domingo de Páscoa
+EASTER_HOLIDAYS = (
+    -48,  # Segunda-feira de Carnaval
+    -47,  # Terça-feira de Carnaval
+    -2,   # Sexta-feira Santa
+    60,   # Corpus Christi
+)
+
+# Domingo de Páscoa de cada ano (algoritmo de Meeus/Jones/Butcher para o calendário gregoriano)
+def easter(years):
+    years = np.asarray(years, dtype=np.int64)
+    a = years % 19
+    b, c = years // 100, years % 100
+    d, e = b // 4, b % 4
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month = (h + l - 7 * m + 114) // 31
+    day = (h + l - 7 * m + 114) % 31 + 1
+    return _dates(years, month, day)
+
+# Datas (datetime64[D]) a partir de arrays de ano, mês e dia
+def _dates(years, months, days):
+    months_since_epoch = (np.asarray(years) - 1970) * 12 + np.asarray(months) - 1
+    return months_since_epoch.astype('datetime64[M]').astype('datetime64[D]') + (np.asarray(days) - 1)
+
+# Feriados nacionais de first_year a last_year, ordenados
+def national_holidays(first_year, last_year):
+    years = np.arange(first_year, last_year + 1)
+    holidays = [_dates(years[years >= (since or first_year)], month, day) for (month, day), since in FIXED_HOLIDAYS]
+    easter_days = easter(years)
+    holidays += [easter_days + offset for offset in EASTER_HOLIDAYS]
+    return np.unique(np.concatenate(holidays))
+
+class BusinessCalendar:
+    # first_day, last_day: intervalo coberto; holidays: datas que não são dias úteis além dos fins de semana
+    def __init__(self, first_day, last_day, holidays=()):
+        self.first_day = np.datetime64(first_day, 'D')
+        self.last_day = np.datetime64(last_day, 'D')
+        days = np.arange(self.first_day, self.last_day + 1)
+
+        # 1970-01-01 foi uma quinta-feira: (dias desde então + 3) % 7 dá 0 na segunda e 5 e 6 no fim de semana
+        weekdays = (days.astype(np.int64) + 3) % 7
+        business = (weekdays < 5) & ~np.isin(days, np.asarray(holidays, dtype='datetime64[D]'))
+
+        # Um bit por dia e, para a contagem, a quantidade de dias úteis antes de cada dia
+        self.bitmap = np.packbits(business)
+        self._counts = np.concatenate([[0], np.cumsum(business, dtype=np.int32)])
+
+    def _offsets(self, dates, allow_end=False):
+        offsets = (np.asarray(dates, dtype='datetime64[D]') - self.first_day).astype(np.int64)
+        limit = len(self._counts) - (0 if allow_end else 1)
+        if np.any(offsets < 0) or np.any(offsets >= limit):
+            raise ValueError(f"data fora do calendário ({self.first_day} a {self.last_day})")
+        return offsets
+
+    # Se cada data é dia útil
+    def is_business_day(self, dates):
+        offsets = self._offsets(dates)
+        return ((self.bitmap[offsets >> 3] >> (7 - (offsets & 7))) & 1).astype(bool)
+
+    # Quantidade de dias úteis d com start <= d < end (negativa se end vier antes de start)
+    def business_days(self, start, end):
+        return self._counts[self._offsets(end, allow_end=True)] - self._counts[self._offsets(start, allow_end=True)]
+
+# Calendário padrão com os feriados nacionais, montado uma única vez por processo
+@functools.lru_cache(maxsize=1)
+def default_calendar():
+    first_year = int(str(FIRST_DAY)[:4])
+    last_year = int(str(LAST_DAY)[:4])
+    return BusinessCalendar(FIRST_DAY, LAST_DAY, national_holidays(first_year, last_year))
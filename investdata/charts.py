@@ -0,0 +1,75 @@
+import numpy as np
+
+# Funções auxiliares para gráficos com muitos pontos
+
+# Quantos rótulos cada série pode ter para que o gráfico inteiro fique dentro do limite
+def labels_per_series(num_series, max_labels):
+    if num_series <= 0:
+        return 0
+    return max_labels // num_series
+
+# Índices dos pontos que recebem rótulo numa série
+# Sempre que possível inclui o primeiro, o último, o máximo e o mínimo; o restante do
+# limite é distribuído igualmente ao longo da série
+def label_indices(values, max_labels):
+    values = np.asarray(values)
+    n = len(values)
+    if n <= max_labels:
+        return np.arange(n)
+    if max_labels <= 0:
+        return np.arange(0)
+
+    key_points = np.array([n - 1, 0, int(np.argmax(values)), int(np.argmin(values))])[:max_labels]
+    spaced = np.linspace(0, n - 1, max_labels - len(key_points)).round().astype(int)
+    return np.unique(np.concatenate([key_points, spaced]))
+
+# Índices dos pontos escolhidos pelo LTTB (Largest-Triangle-Three-Buckets) para representar a série
+# com no máximo threshold pontos preservando o formato da curva: o primeiro e o último ponto são
+# mantidos e, em cada faixa intermediária, fica o ponto que forma o maior triângulo com o ponto
+# escolhido na faixa anterior e a média da faixa seguinte
+def lttb_indices(x, y, threshold):
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (threshold - 2)
+    edges = np.minimum((np.arange(threshold) * every).astype(int) + 1, n)  # limites das faixas
+
+    selected = np.empty(threshold, dtype=int)
+    selected[0] = 0
+    a = 0
+    for i in range(threshold - 2):
+        start, end, next_end = edges[i], edges[i + 1], edges[i + 2]
+        average_x = x[end:next_end].mean()
+        average_y = y[end:next_end].mean()
+        areas = np.abs((x[a] - average_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (average_y - y[a]))
+        a = start + int(np.argmax(areas))
+        selected[i + 1] = a
+    selected[-1] = n - 1
+    return selected
+
+# Índices para reduzir várias séries que dividem o mesmo eixo x a no máximo threshold pontos cada
+# União dos pontos escolhidos pelo LTTB em cada série, para todas continuarem com um único eixo
+def downsample_indices(series, threshold):
+    series = [np.asarray(values) for values in series]
+    n = len(series[0]) if series else 0
+    if n <= threshold:
+        return np.arange(n)
+    x = np.arange(n)
+    return np.unique(np.concatenate([lttb_indices(x, values, threshold) for values in series]))
+
+# Gráfico de comparação da renda fixa: uma linha por investimento (values: nome -> valores), todas
+# sobre o mesmo eixo de datas, com eixo Y logarítmico; markers desenha um marcador em cada ponto
+def fixed_income_figure(dates, values, markers=False):
+    import plotly.graph_objects as go
+
+    mode = 'lines+markers' if markers else 'lines'
+    fig = go.Figure()
+    for name, series in values.items():
+        fig.add_trace(go.Scatter(x=dates, y=series, mode=mode, name=name, marker=dict(size=6, symbol='circle'),
+                                 hovertemplate='%{x|%B %Y}<br>R$ %{y:,.2f}<extra></extra>'))
+    fig.update_layout(xaxis_title='Mês', yaxis=dict(title='Valor Final (R$)', type='log'),
+                      legend_title_text='Tipo de Investimento')
+    return fig
@@ -0,0 +1,60 @@
+import numpy as np
+
+from investdata.backtest import value_curve
+from investdata.business_days import default_calendar
+
+# Projeções com capitalização diária, como os produtos atrelados ao CDI de fato rendem:
+# a taxa anual vira uma taxa por dia útil na base de 252 dias úteis por ano, e cada aporte rende
+# pelos dias úteis entre a data em que foi feito e a data avaliada, contados no calendário de
+# dias úteis (investdata.business_days). O IR de cada aporte segue os dias corridos em que ficou aplicado.
+# A projeção usa as mesmas funções do backtest, trocando o índice das taxas históricas por um
+# índice com a taxa atual fixa.
+
+BUSINESS_DAYS_PER_YEAR = 252
+
+# Taxa por dia útil (decimal) equivalente a percent% de uma taxa anual em %
+def daily_rate(annual_rate, percent=100.0):
+    return ((1 + np.asarray(annual_rate) / 100) ** (1 / BUSINESS_DAYS_PER_YEAR) - 1) * np.asarray(percent) / 100
+
+class ProjectedIndex:
+    # Mesma interface do AccrualIndex do backtest, com uma taxa diária constante
+    def __init__(self, annual_rate, percent=100.0, calendar=None):
+        self.rate = daily_rate(annual_rate, percent)
+        self.calendar = calendar or default_calendar()
+
+    # Fator de rendimento de um valor aplicado em start e resgatado em end; aceita arrays de datas
+    def factor(self, start, end):
+        return (1 + self.rate) ** self.calendar.business_days(start, end)
+
+# Mesma data months meses depois de start (ou o último dia do mês, se ele for mais curto); aceita arrays
+def add_months(start, months):
+    start = np.datetime64(start, 'D')
+    month = start.astype('datetime64[M]') + np.asarray(months)
+    day = start - start.astype('datetime64[M]').astype('datetime64[D]')
+    return np.minimum(month.astype('datetime64[D]') + day, (month + 1).astype('datetime64[D]') - 1)
+
+# Datas e valores dos aportes de uma projeção de months meses a partir de start: o investimento inicial
+# em start e um aporte no aniversário de cada mês, até o vencimento (como nas fórmulas mensais)
+def monthly_schedule(start, months, initial_value, contribution_value):
+    dates = add_months(start, np.arange(months + 1))
+    amounts = np.full(months + 1, float(contribution_value))
+    amounts[0] = initial_value
+    return dates, amounts
+
+# Valores de CDB (com IR) e LCI/LCA (isenta) com capitalização diária em cada data de eval_dates
+# (por padrão, só no vencimento, months meses depois de start)
+def project_fixed_income_daily(initial_value, contribution_value, start, months, cdb_rate, lci_lca_rate, cdi_rate,
+                               eval_dates=None, calendar=None):
+    dates, amounts = monthly_schedule(start, months, initial_value, contribution_value)
+    eval_dates = dates[-1:] if eval_dates is None else eval_dates
+    return {
+        'CDB': value_curve(ProjectedIndex(cdi_rate, cdb_rate, calendar), dates, amounts, eval_dates, taxed=True),
+        'LCI/LCA': value_curve(ProjectedIndex(cdi_rate, lci_lca_rate, calendar), dates, amounts, eval_dates),
+    }
+
+# Valor do cofrinho (percentual do CDI, sem IR) com capitalização diária em cada data de eval_dates
+def cofrinho_daily(cdi_rate, initial_value, start, months, contribution_value, percent=100.0, eval_dates=None,
+                   calendar=None):
+    dates, amounts = monthly_schedule(start, months, initial_value, contribution_value)
+    eval_dates = dates[-1:] if eval_dates is None else eval_dates
+    return value_curve(ProjectedIndex(cdi_rate, percent, calendar), dates, amounts, eval_dates)
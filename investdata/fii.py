@@ -0,0 +1,95 @@
+import numpy as np
+
+# Simulação de fundos imobiliários com reinvestimento de dividendos
+# calculateProfit simula um fundo por vez; calculateProfitBatch simula vários fundos juntos,
+# guardando o estado de todos eles (cotas, valor investido, retorno do mês) em arrays NumPy.
+
+# Função para calcular o lucro de um fundo
+def calculateProfit(price, dy, numShares, monthlyShares, months):
+    monthlyReturnRate = (dy / 12)  # Converte o DY anual para uma taxa de retorno mensal
+
+    totalInvestment = price * numShares  # Calcula o investimento total inicial
+    profitValues = []  # Lista para armazenar o lucro acumulado a cada mês
+    totalShares = numShares  # Armazena o número total de cotas, começando com as cotas iniciais
+    monthlyProfits = []  # Lista para armazenar os lucros mensais
+    investmentValues = []  # Lista para armazenar o valor total investido ao longo do tempo
+
+    # Loop para calcular os lucros mês a mês
+    for month in range(1, months + 1):
+        monthlyReturn = totalInvestment * monthlyReturnRate  # Calcula o retorno mensal
+        reinvestedShares = int(monthlyReturn / price)  # Reinveste os dividendos comprando mais cotas inteiras
+        totalShares += reinvestedShares + monthlyShares  # Atualiza o número total de cotas
+        totalInvestment += monthlyReturn + (monthlyShares * price)  # Atualiza o valor total investido
+        profit = totalInvestment - (price * (numShares + monthlyShares * month))  # Calcula o lucro
+        profitValues.append(profit)  # Armazena o lucro do mês atual
+        monthlyProfits.append(monthlyReturn)  # Armazena o retorno mensal
+        investmentValues.append(totalInvestment)  # Armazena o valor investido no mês atual
+    
+    return profitValues, monthlyProfits, investmentValues  # Retorna as listas de lucros, retornos mensais e valores investidos
+
+# Função para calcular o lucro de vários fundos ao mesmo tempo
+# Os parâmetros são sequências com um valor por fundo; cada mês avança todos os fundos de uma vez.
+# Retorna arrays (fundos x meses) de lucros, retornos mensais, valores investidos e cotas
+# Para continuar uma simulação já feita até o mês startMonth, passe em startShares e startInvestment
+# as cotas e o valor investido de cada fundo nesse mês: só os meses seguintes são calculados (e
+# retornados), com o mesmo resultado de simular tudo de uma vez
+def calculateProfitBatch(prices, dys, numShares, monthlyShares, months, startMonth=0, startShares=None, startInvestment=None):
+    prices = np.asarray(prices, dtype=float)
+    numShares = np.asarray(numShares, dtype=float)
+    monthlyShares = np.asarray(monthlyShares, dtype=float)
+    monthlyReturnRate = np.asarray(dys, dtype=float) / 12  # Converte o DY anual para uma taxa de retorno mensal
+
+    # Estado de todos os fundos
+    if startMonth:
+        totalInvestment = np.array(startInvestment, dtype=float)  # Valor investido no mês startMonth
+        totalShares = np.array(startShares, dtype=float)  # Cotas no mês startMonth
+    else:
+        totalInvestment = prices * numShares  # Investimento total inicial de cada fundo
+        totalShares = numShares.copy()  # Número total de cotas de cada fundo
+    monthlyContribution = monthlyShares * prices  # Valor gasto todo mês com as cotas compradas
+
+    columns = max(months - startMonth, 0)
+    profitValues = np.empty((len(prices), columns))
+    monthlyProfits = np.empty((len(prices), columns))
+    investmentValues = np.empty((len(prices), columns))
+    shareCounts = np.empty((len(prices), columns))
+
+    for month in range(startMonth + 1, months + 1):
+        monthlyReturn = totalInvestment * monthlyReturnRate  # Retorno mensal de cada fundo
+        reinvestedShares = np.trunc(monthlyReturn / prices)  # Reinveste os dividendos comprando cotas inteiras, como int()
+        totalShares += reinvestedShares + monthlyShares
+        totalInvestment += monthlyReturn + monthlyContribution
+
+        column = month - startMonth - 1
+        profitValues[:, column] = totalInvestment - (prices * (numShares + monthlyShares * month))
+        monthlyProfits[:, column] = monthlyReturn
+        investmentValues[:, column] = totalInvestment
+        shareCounts[:, column] = totalShares
+
+    return profitValues, monthlyProfits, investmentValues, shareCounts
+
+# Função para calcular só a situação final de vários fundos, cada um com o seu próprio prazo
+# months tem um valor por fundo; os fundos cujo prazo já terminou ficam parados até o fim do laço.
+# Retorna arrays (um valor por fundo) do lucro, do último retorno mensal, do valor investido e das cotas,
+# iguais à última coluna de calculateProfitBatch (fundos com prazo zero ficam com lucro e retorno zero)
+def calculateFinalBatch(prices, dys, numShares, monthlyShares, months):
+    prices = np.asarray(prices, dtype=float)
+    numShares = np.asarray(numShares, dtype=float)
+    monthlyShares = np.asarray(monthlyShares, dtype=float)
+    months = np.asarray(months, dtype=int)
+    monthlyReturnRate = np.asarray(dys, dtype=float) / 12
+
+    totalInvestment = prices * numShares
+    totalShares = numShares.copy()
+    monthlyContribution = monthlyShares * prices
+    monthlyReturn = np.zeros(len(prices))
+
+    for month in range(1, int(months.max(initial=0)) + 1):
+        active = months >= month  # Fundos que ainda estão dentro do prazo
+        monthlyReturn = np.where(active, totalInvestment * monthlyReturnRate, monthlyReturn)
+        reinvestedShares = np.trunc(monthlyReturn / prices)
+        totalShares += np.where(active, reinvestedShares + monthlyShares, 0)
+        totalInvestment += np.where(active, monthlyReturn + monthlyContribution, 0)
+
+    profit = np.where(months > 0, totalInvestment - (prices * (numShares + monthlyShares * months)), 0.0)
+    return profit, monthlyReturn, totalInvestment, totalShares
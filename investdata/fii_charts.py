@@ -0,0 +1,92 @@
+# Gráficos do simulador de fundos imobiliários
+# Cada gráfico é montado com o matplotlib (imagem estática) ou com o Plotly (interativo). As figuras
+# do matplotlib são criadas direto pela classe Figure, fora do estado global do pyplot, que não é
+# seguro com várias sessões montando gráficos ao mesmo tempo. As bibliotecas só são importadas
+# quando um gráfico é montado.
+
+# Função para formatar valores no eixo y (em reais)
+def currencyFormat(x, _):
+    return f'R$ {x:,.2f}'
+
+# Limite de rótulos de texto por gráfico (divididos entre os fundos), de meses para desenhar marcadores
+# e de fundos para exibir a legenda
+MAX_LABELS = 48
+MAX_MARKER_MONTHS = 60
+MAX_LEGEND_ENTRIES = 20
+
+# Cria a figura e os eixos de um gráfico, com a formatação comum aos dois gráficos
+def createFigure(title, yLabel):
+    from matplotlib.figure import Figure
+    from matplotlib.ticker import FuncFormatter
+
+    fig = Figure(figsize=(12, 6))  # Define o tamanho do gráfico
+    ax = fig.subplots()
+    ax.set_title(title)  # Título do gráfico
+    ax.set_xlabel('Meses')  # Rótulo do eixo x
+    ax.set_ylabel(yLabel)  # Rótulo do eixo y
+    ax.yaxis.set_major_formatter(FuncFormatter(currencyFormat))  # Formata o eixo y para mostrar valores em reais
+    ax.tick_params(axis='x', labelrotation=45)  # Rotaciona os rótulos dos meses para melhorar a legibilidade
+    return fig, ax
+
+# Desenha uma linha por fundo, com rótulos apenas nos meses escolhidos por label_indices
+def drawSeries(ax, values, labelValues, months, labels, prefix):
+    import numpy as np
+    from investdata.charts import label_indices, labels_per_series
+
+    monthsList = np.arange(1, months + 1)  # Números dos meses
+    marker = 'o' if months <= MAX_MARKER_MONTHS else None  # Marcadores só em simulações curtas
+    perFund = labels_per_series(len(labels), MAX_LABELS)
+    for value, labelValue, label in zip(values, labelValues, labels):
+        ax.plot(monthsList, value, marker=marker, label=f'{prefix} - {label}')  # Plota a linha do fundo
+        for i in label_indices(value, perFund):
+            ax.text(i + 1, value[i], f'R$ {labelValue[i]:,.2f}', ha='center', va='bottom', fontsize=8)  # Rótulo do mês
+    if len(labels) <= MAX_LEGEND_ENTRIES:
+        ax.legend()  # Exibe a legenda do gráfico
+    else:
+        # Com muitos fundos a legenda cobriria o gráfico (e dominaria o tempo de desenho): mostra só a quantidade
+        ax.text(0.01, 0.99, f'{len(labels)} fundos', transform=ax.transAxes, ha='left', va='top', fontsize=8)
+
+# Versão final de um gráfico, pronta para ser exibida e guardada no cache de resultados
+# Figuras do Plotly são usadas como estão; as do matplotlib viram a mesma imagem PNG que o st.pyplot
+# geraria; a figura não fica registrada em lugar nenhum, então é liberada junto com a referência
+def finishFigure(fig, interactive=False):
+    if interactive:
+        return fig
+    import io
+
+    image = io.BytesIO()
+    fig.savefig(image, format='png', bbox_inches='tight', dpi=200)
+    return image.getvalue()
+
+# Gráfico interativo com Plotly: os valores de cada mês aparecem ao passar o mouse, sem rótulos fixos
+def plotInteractiveGraph(values, hoverValues, months, labels, title, yLabel, prefix):
+    import numpy as np
+    import plotly.graph_objects as go
+
+    monthsList = np.arange(1, months + 1)
+    fig = go.Figure()
+    for value, hoverValue, label in zip(values, hoverValues, labels):
+        fig.add_trace(go.Scatter(x=monthsList, y=value, customdata=hoverValue, mode='lines', name=f'{prefix} - {label}',
+                                 hovertemplate='Mês %{x}<br>R$ %{customdata:,.2f}<extra></extra>'))
+    fig.update_layout(title=title, xaxis_title='Meses', yaxis_title=yLabel, yaxis_tickprefix='R$ ')
+    return fig
+
+# Função para montar o gráfico de lucro (exibido depois com showFigure)
+def plotProfitGraph(profitValues, monthlyProfits, months, labels, interactive=False):
+    title = 'Gráfico de Lucro com Reinvestimento de Dividendos'
+    if interactive:
+        return plotInteractiveGraph(profitValues, monthlyProfits, months, labels, title, 'Lucro (R$)', 'Lucro')
+
+    fig, ax = createFigure(title, 'Lucro (R$)')
+    drawSeries(ax, profitValues, monthlyProfits, months, labels, 'Lucro')  # Rótulos mostram os retornos mensais
+    return fig
+
+# Função para montar o gráfico de investimento ao longo do tempo (exibido depois com showFigure)
+def plotInvestmentGraph(investmentValues, months, labels, interactive=False):
+    title = 'Gráfico de Investimento ao Longo do Tempo'
+    if interactive:
+        return plotInteractiveGraph(investmentValues, investmentValues, months, labels, title, 'Valor do Investimento (R$)', 'Investimento')
+
+    fig, ax = createFigure(title, 'Valor do Investimento (R$)')
+    drawSeries(ax, investmentValues, investmentValues, months, labels, 'Investimento')  # Rótulos mostram o valor investido
+    return fig
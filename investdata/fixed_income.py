@@ -0,0 +1,180 @@
+import numpy as np
+
+# Calculadoras de renda fixa (CDB, LCI/LCA e Poupança)
+# As funções escalares calculam o valor final para um único prazo; as funções *_value
+# calculam vários cenários de uma vez e as funções *_curve a curva mês a mês inteira, usando NumPy.
+
+# Cálculo do CDB
+def calculate_cdb(initial_value, cdb_rate, cdi_rate, years, contribution_value):
+    # Conversão de % para decimal
+    cdi_rate /= 100
+    cdb_rate /= 100
+
+    # Valor futuro do investimento inicial (juros compostos) i,t = anual
+    # Fórmula dos Juros Compostos vista em sala
+    # M = C * (1 + i)^t
+    # final = inicial * (1 + taxa) ** years
+    final_rate = cdb_rate * cdi_rate
+    final_value = initial_value * (1 + final_rate) ** years
+
+    # Valor futuro dos aportes mensais (valor futuro de anuidade ordinária) i,t = mensal
+    # VF = C * (((1 + i)^t-1) / i)
+    # monthly_rate = (1 + final_rate) ** (1/12) = i
+    # months = int(years * 12) = t
+    monthly_rate = (1 + final_rate) ** (1 / 12) - 1
+    months = int(years * 12)
+    final_contribution_value = contribution_value * (((1 + monthly_rate) ** months - 1) / monthly_rate)
+
+    # Soma do rendimento dos montantes + rendimento do investimento inicial
+    total_value = final_value + final_contribution_value
+    
+    # Extrair lucros totais para cálculo do IR :(
+    total_earnings = total_value - initial_value - (contribution_value * months)
+
+    # Cálculo do imposto a depender do tempo de aplicação
+    tax_rate = 0.15 
+    if years <= 0.5:
+        tax_rate = 0.225
+    elif years <= 1:
+        tax_rate = 0.20
+    elif years <= 2:
+        tax_rate = 0.175
+    else:
+        tax_rate = 0.15
+    
+    # Aplicação do IR
+    taxes = total_earnings * tax_rate
+    return_value = total_value - taxes
+    return return_value
+
+# Cálculo do LCI/LCA
+def calculate_lci_lca(initial_value, lc_rate, cdi_rate, years, contribution_value):
+    # Conversão de % para decimal e de anos para meses
+    cdi_rate /= 100  
+    lc_rate /= 100  
+    months = int(years * 12)
+
+    # Valor futuro do investimento inicial
+    # Fórmula dos Juros Compostos vista em sala
+    # M = C * (1 + i)^t
+    final_rate = lc_rate * cdi_rate
+    final_value = initial_value * (1 + final_rate) ** years
+
+    # Valor futuro dos aportes mensais (valor futuro de anuidade ordinária) i,t = mensal
+    # VF = C * (((1 + i)^t-1) / i)
+    # monthly_rate = (1 + final_rate) ** (1/12) = i
+    # months = int(years * 12) = t
+    monthly_rate = (1 + final_rate) ** (1 / 12) - 1
+    future_value_contributions = contribution_value * (((1 + monthly_rate) ** months - 1) / monthly_rate)
+
+    # Retorno do valor total, isento de IR :)
+    return final_value + future_value_contributions
+
+# Cálculo do rendimento da poupança
+def calculate_savings(initial_value, selic_rate, years, contribution_value, ref_rate):
+    # Calcular rentabilidade da poupança
+    if selic_rate <= 8.5:
+        monthly_rate = 0.007
+    else:
+        monthly_rate = 0.005
+    
+    monthly_rate += (ref_rate / 100)
+    
+    # Anos para meses
+    months = int(years * 12)
+    
+    # Montante final
+    # Novamente juros compostos
+    final_value = initial_value * (1 + monthly_rate) ** months
+    future_value_contributions = contribution_value * (((1 + monthly_rate) ** months - 1) / monthly_rate)
+
+    # Retorno do valor total, também isento de IR :)
+    return final_value + future_value_contributions
+
+# Alíquota de IR (tabela regressiva) para cada prazo em meses
+def ir_rate(months):
+    months = np.asarray(months)
+    # Mesmas faixas de calculate_cdb: até 6 meses, até 1 ano, até 2 anos e acima de 2 anos
+    return np.select(
+        [months <= 6, months <= 12, months <= 24],
+        [0.225, 0.20, 0.175],
+        default=0.15,
+    )
+
+# Alíquota de IR (tabela regressiva) para cada prazo em dias corridos
+def ir_rate_days(days):
+    days = np.asarray(days)
+    # Até 180 dias, até 360 dias, até 720 dias e acima de 720 dias
+    return np.select(
+        [days <= 180, days <= 360, days <= 720],
+        [0.225, 0.20, 0.175],
+        default=0.15,
+    )
+
+# Valor futuro dos aportes mensais, elemento a elemento
+# VF = C * (((1 + i)^t-1) / i), com VF = C * t quando a taxa é zero
+def _annuity(contribution_value, monthly_rate, months):
+    monthly_rate = np.asarray(monthly_rate, dtype=float)
+    safe_rate = np.where(monthly_rate == 0, 1.0, monthly_rate)
+    return np.where(
+        monthly_rate == 0,
+        contribution_value * months,
+        contribution_value * (((1 + monthly_rate) ** months - 1) / safe_rate),
+    )
+
+# As funções *_value aceitam arrays em qualquer parâmetro (com broadcasting do NumPy), e
+# months é o prazo em meses inteiros. Cada elemento do resultado é igual à função escalar
+# correspondente chamada com years = months / 12.
+
+# Valor final do CDB, já descontado o IR
+def cdb_value(initial_value, cdb_rate, cdi_rate, months, contribution_value):
+    months = np.asarray(months)
+    final_rate = (np.asarray(cdb_rate) / 100) * (np.asarray(cdi_rate) / 100)
+
+    # M = C * (1 + i)^t com t em anos, igual à versão escalar
+    final_value = initial_value * (1 + final_rate) ** (months / 12)
+    monthly_rate = (1 + final_rate) ** (1 / 12) - 1
+    total_value = final_value + _annuity(contribution_value, monthly_rate, months)
+
+    # IR sobre o lucro, com a alíquota da faixa correspondente ao prazo
+    total_earnings = total_value - initial_value - (contribution_value * months)
+    return total_value - total_earnings * ir_rate(months)
+
+# Valor final da LCI/LCA, isenta de IR
+def lci_lca_value(initial_value, lc_rate, cdi_rate, months, contribution_value):
+    months = np.asarray(months)
+    final_rate = (np.asarray(lc_rate) / 100) * (np.asarray(cdi_rate) / 100)
+
+    final_value = initial_value * (1 + final_rate) ** (months / 12)
+    monthly_rate = (1 + final_rate) ** (1 / 12) - 1
+    return final_value + _annuity(contribution_value, monthly_rate, months)
+
+# Taxa mensal da poupança: 0,5% ao mês com Selic acima de 8,5% (senão 0,7%), mais a TR
+def savings_monthly_rate(selic_rate, ref_rate):
+    return np.where(np.asarray(selic_rate) <= 8.5, 0.007, 0.005) + (np.asarray(ref_rate) / 100)
+
+# Valor final da poupança, isenta de IR
+def savings_value(initial_value, selic_rate, months, contribution_value, ref_rate):
+    months = np.asarray(months)
+    monthly_rate = savings_monthly_rate(selic_rate, ref_rate)
+
+    final_value = initial_value * (1 + monthly_rate) ** months
+    return final_value + _annuity(contribution_value, monthly_rate, months)
+
+# Curvas mês a mês (mês 0 até months) de cada produto
+def cdb_curve(initial_value, cdb_rate, cdi_rate, months, contribution_value):
+    return cdb_value(initial_value, cdb_rate, cdi_rate, np.arange(months + 1), contribution_value)
+
+def lci_lca_curve(initial_value, lc_rate, cdi_rate, months, contribution_value):
+    return lci_lca_value(initial_value, lc_rate, cdi_rate, np.arange(months + 1), contribution_value)
+
+def savings_curve(initial_value, selic_rate, months, contribution_value, ref_rate):
+    return savings_value(initial_value, selic_rate, np.arange(months + 1), contribution_value, ref_rate)
+
+# Projeção dos três produtos de uma vez, no formato usado pela página de Renda Fixa
+def project_fixed_income(initial_value, contribution_value, months, cdb_rate, lci_lca_rate, cdi_rate, selic_rate, ref_rate):
+    return {
+        'CDB': cdb_curve(initial_value, cdb_rate, cdi_rate, months, contribution_value),
+        'LCI/LCA': lci_lca_curve(initial_value, lci_lca_rate, cdi_rate, months, contribution_value),
+        'Poupança': savings_curve(initial_value, selic_rate, months, contribution_value, ref_rate),
+    }
@@ -0,0 +1,99 @@
+import datetime
+
+from investdata import instrumentation
+
+# Simulação do simulador de renda fixa: curvas de CDB, LCI/LCA e Poupança, tabela de resultados e
+# gráfico, como a página os exibe. Fica fora da página para ser chamada também pelos benchmarks e
+# pelo teste de carga. Pandas, Plotly e NumPy só são importados quando a simulação roda.
+
+# Limite de pontos por série no gráfico (horizontes maiores são reduzidos com LTTB) e de meses para desenhar marcadores
+MAX_CHART_POINTS = 400
+MAX_MARKER_MONTHS = 60
+
+# Calcula a simulação e monta a tabela de resultados e o gráfico
+# checkpoints: dicionário com o checkpoint de cada curva (a página guarda o da sessão), atualizado aqui
+# timer: medição das etapas (por padrão, uma nova medição da página 'custom')
+# Retorna {'result_df': tabela, 'fig': gráfico, 'maturity': data do vencimento}
+def build_simulation(investment_value, monthly_contribution, total_months, cdb_rentability, lci_lca_rentability,
+                     cdi, selic, tr, daily=False, checkpoints=None, timer=None):
+    import numpy as np
+    import pandas as pd
+    from investdata.backtest import value_curve
+    from investdata.charts import downsample_indices, fixed_income_figure
+    from investdata.daily_accrual import ProjectedIndex, add_months, monthly_schedule
+    from investdata.fixed_income import cdb_value, lci_lca_value, savings_value
+    from investdata.incremental import extend_curve
+
+    checkpoints = {} if checkpoints is None else checkpoints
+    timer = timer or instrumentation.start_page('custom')
+
+    today = np.datetime64(datetime.date.today(), 'D')
+    if daily:
+        # Eixo de datas: o mesmo dia de cada mês, a partir de hoje, até o vencimento
+        month_dates = add_months(today, np.arange(total_months + 1))
+    else:
+        # Eixo de datas: último dia de cada mês, a partir do mês atual
+        month_dates = (today.astype('datetime64[M]') + np.arange(total_months + 1) + 1).astype('datetime64[D]') - 1
+
+    # Curva mês a mês de cada investimento nos meses pedidos, a fim de exibir no gráfico
+    # Na capitalização diária, CDB e LCI/LCA rendem por dia útil em cada data do eixo; a Poupança segue a regra mensal
+    def daily_curve(rate, taxed):
+        def compute(month_range):
+            dates, amounts = monthly_schedule(today, int(month_range[-1]), investment_value, monthly_contribution)
+            return value_curve(ProjectedIndex(cdi, rate), dates, amounts, add_months(today, month_range), taxed=taxed)
+        return compute
+
+    curves = {
+        'CDB': ((cdb_rentability, cdi, daily and str(today)),
+                daily_curve(cdb_rentability, True) if daily else
+                lambda month_range: cdb_value(investment_value, cdb_rentability, cdi, month_range, monthly_contribution)),
+        'LCI/LCA': ((lci_lca_rentability, cdi, daily and str(today)),
+                    daily_curve(lci_lca_rentability, False) if daily else
+                    lambda month_range: lci_lca_value(investment_value, lci_lca_rentability, cdi, month_range, monthly_contribution)),
+        'Poupança': ((selic, tr),
+                     lambda month_range: savings_value(investment_value, selic, month_range, monthly_contribution, tr)),
+    }
+
+    # Cada curva continua do seu checkpoint: aumentar o prazo calcula só os meses novos
+    # e mudar a rentabilidade de um investimento refaz só a curva dele
+    with timer.stage('compute'):
+        growth = {}
+        for product, (params, compute) in curves.items():
+            checkpoints[product], growth[product] = extend_curve(
+                checkpoints.get(product), (investment_value, monthly_contribution, *params), total_months, compute)
+    cdb_growth = growth['CDB']
+    lci_lca_growth = growth['LCI/LCA']
+    savings_growth = growth['Poupança']
+    months = range(total_months + 1)
+
+    with timer.stage('frame'):
+        # Pontos do gráfico: todos os meses em horizontes curtos e, nos longos, os escolhidos pelo LTTB
+        # (em float32, que basta para a tela e reduz pela metade o que vai para o navegador)
+        chart_points = downsample_indices(list(growth.values()), MAX_CHART_POINTS)
+        chart_dates = month_dates[chart_points]
+        chart_values = {name: values[chart_points].astype(np.float32) for name, values in growth.items()}
+
+        # Calculando o lucro individual de cada investimento (montante final - investimento inicial - contribuições mensais)
+        total_contributions = monthly_contribution * (len(months)-1)
+
+        cdb_profit = cdb_growth[-1] - investment_value - total_contributions
+        lci_lca_profit = lci_lca_growth[-1] - investment_value - total_contributions
+        savings_profit = savings_growth[-1] - investment_value - total_contributions
+
+        # Calculando o valor total investido
+        total_investido = investment_value + total_contributions
+
+        # Criando o DataFrame para comparar investimentos (com os valores exatos, sem redução)
+        result_df = pd.DataFrame({
+            'Tipo de Investimento': ['CDB', 'LCI/LCA', 'Poupança'],
+            'Investimento Inicial (R$)': [investment_value] * 3,
+            'Aportes Mensais (R$)': [total_contributions] * 3,
+            'Lucro Final (R$)': [cdb_profit, lci_lca_profit, savings_profit],
+            'Valor Total (R$)': [cdb_growth[-1], lci_lca_growth[-1], savings_growth[-1]]
+        })
+
+    with timer.stage('chart'):
+        # Uma linha por investimento, todas sobre o mesmo eixo de datas, com eixo Y logarítmico
+        fig = fixed_income_figure(chart_dates, chart_values, markers=total_months <= MAX_MARKER_MONTHS)
+
+    return {'result_df': result_df, 'fig': fig, 'maturity': month_dates[-1].astype(datetime.date)}
@@ -0,0 +1,59 @@
+import numpy as np
+
+from investdata.fii import calculateProfitBatch
+
+# Recálculo incremental das simulações mês a mês
+# Cada curva (um produto de renda fixa ou um fundo imobiliário) fica guardada num checkpoint junto
+# com os parâmetros que a geraram. Quando só o prazo aumenta, a simulação continua a partir do último
+# mês calculado; quando o prazo diminui, a curva guardada é cortada; e só as curvas cujos parâmetros
+# mudaram são refeitas do início. Os checkpoints são dicionários simples, para as páginas guardarem
+# em st.session_state.
+
+# Curva de months meses (mês 0 até months) a partir do checkpoint
+# compute(month_range) calcula os valores da curva nos meses pedidos (array de meses inteiros)
+# Retorna (checkpoint atualizado, valores)
+def extend_curve(checkpoint, params, months, compute):
+    if checkpoint is None or checkpoint['params'] != params:
+        values = compute(np.arange(months + 1))
+    elif len(checkpoint['values']) > months:
+        return checkpoint, checkpoint['values'][:months + 1]
+    else:
+        computed = len(checkpoint['values'])
+        values = np.concatenate([checkpoint['values'], compute(np.arange(computed, months + 1))])
+    return {'params': params, 'values': values}, values
+
+# Simulação de vários fundos imobiliários por months meses a partir dos checkpoints de cada fundo
+# funds: [(dy, price, numShares, monthlyShares), ...]; checkpoints: lista com o checkpoint de cada
+# posição (ou None). Fundos com os mesmos parâmetros continuam do último mês calculado, e os fundos
+# que precisam andar a partir do mesmo mês são simulados juntos, com calculateProfitBatch.
+# Retorna (checkpoints atualizados, arrays fundos x meses de lucros, retornos mensais, valores investidos e cotas)
+def extend_funds(checkpoints, funds, months):
+    checkpoints = list(checkpoints) + [None] * (len(funds) - len(checkpoints))
+    checkpoints = checkpoints[:len(funds)]
+
+    # Mês a partir do qual cada fundo precisa ser simulado
+    starts = {}
+    for i, params in enumerate(funds):
+        checkpoint = checkpoints[i]
+        if checkpoint is None or checkpoint['params'] != params:
+            checkpoints[i] = None
+            starts.setdefault(0, []).append(i)
+        elif checkpoint['month'] < months:
+            starts.setdefault(checkpoint['month'], []).append(i)
+
+    for startMonth, indices in starts.items():
+        dys, prices, numShares, monthlyShares = (np.array(values, dtype=float) for values in zip(*(funds[i] for i in indices)))
+        previous = [checkpoints[i] for i in indices]
+        startShares = [checkpoint['shares'][-1] for checkpoint in previous] if startMonth else None
+        startInvestment = [checkpoint['investment'][-1] for checkpoint in previous] if startMonth else None
+        columns = calculateProfitBatch(prices, dys, numShares, monthlyShares, months, startMonth, startShares, startInvestment)
+
+        for row, i in enumerate(indices):
+            new = dict(zip(('profit', 'monthly', 'investment', 'shares'), (values[row] for values in columns)))
+            if checkpoints[i] is not None:
+                new = {name: np.concatenate([checkpoints[i][name], values]) for name, values in new.items()}
+            checkpoints[i] = {'params': funds[i], 'month': months, **new}
+
+    series = [np.array([checkpoint[name][:months] for checkpoint in checkpoints]).reshape(len(funds), months)
+              for name in ('profit', 'monthly', 'investment', 'shares')]
+    return checkpoints, *series
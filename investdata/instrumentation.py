@@ -0,0 +1,142 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Medição de desempenho das páginas
+# Cada execução de página cria um PageTimer e mede suas etapas (busca, cálculo, montagem dos
+# dados, montagem e exibição dos gráficos). Os tempos vão para o log estruturado (uma linha JSON
+# por etapa no logger "investdata.metrics"), para os totais do processo, que podem ser exportados
+# no formato texto do Prometheus, e opcionalmente para um painel de depuração na própria página.
+#
+# INVESTDATA_DEBUG=1 (ou ?debug=1 na URL) mostra o painel; INVESTDATA_METRICS_FILE define o arquivo
+# do Prometheus, e "{pid}" no caminho gera um arquivo por processo para agregar vários workers;
+# INVESTDATA_METRICS_LOG=1 envia o log estruturado para a saída de erro.
+
+logger = logging.getLogger("investdata.metrics")
+if os.environ.get("INVESTDATA_METRICS_LOG") == "1" and not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+
+_lock = threading.Lock()
+_stages = {}  # (página, etapa) -> [quantidade, soma, máximo]
+_counters = {}  # evento -> quantidade
+
+# Acumula o tempo de uma etapa nos totais do processo
+def record_stage(page, stage, seconds):
+    with _lock:
+        totals = _stages.setdefault((page, stage), [0, 0.0, 0.0])
+        totals[0] += 1
+        totals[1] += seconds
+        totals[2] = max(totals[2], seconds)
+
+# Conta um evento (por exemplo acertos e falhas de cache)
+def count(event, value=1):
+    with _lock:
+        _counters[event] = _counters.get(event, 0) + value
+    logger.debug(json.dumps({'event': event, 'value': value}))
+
+# Cópia dos totais do processo: ({(página, etapa): (quantidade, soma, máximo)}, {evento: quantidade})
+def snapshot():
+    with _lock:
+        return {key: tuple(value) for key, value in _stages.items()}, dict(_counters)
+
+# Zera os totais do processo
+def reset():
+    with _lock:
+        _stages.clear()
+        _counters.clear()
+
+class PageTimer:
+    def __init__(self, page):
+        self.page = page
+        self.stages = []  # [(etapa, segundos), ...] desta execução
+        self._start = time.perf_counter()
+
+    # Mede o bloco como uma etapa da página
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.stages.append((name, seconds))
+            record_stage(self.page, name, seconds)
+            logger.info(json.dumps({'page': self.page, 'stage': name, 'seconds': round(seconds, 6)}))
+
+    # Fecha a execução: registra o tempo total, exporta as métricas e mostra o painel, se ativado
+    def finish(self):
+        total = time.perf_counter() - self._start
+        self.stages.append(('total', total))
+        record_stage(self.page, 'total', total)
+        logger.info(json.dumps({'page': self.page, 'stage': 'total', 'seconds': round(total, 6)}))
+
+        metrics_file = os.environ.get("INVESTDATA_METRICS_FILE")
+        if metrics_file:
+            write_prometheus(metrics_file.format(pid=os.getpid()))
+        if debug_enabled():
+            debug_panel(self)
+
+# Início da medição de uma execução de página
+def start_page(page):
+    return PageTimer(page)
+
+# Métricas no formato texto do Prometheus
+def prometheus_text():
+    stages, counters = snapshot()
+    lines = [
+        "# HELP investdata_stage_seconds Tempo gasto em cada etapa das páginas",
+        "# TYPE investdata_stage_seconds summary",
+    ]
+    for (page, stage), (quantity, total, _) in sorted(stages.items()):
+        labels = f'page="{page}",stage="{stage}"'
+        lines.append(f"investdata_stage_seconds_count{{{labels}}} {quantity}")
+        lines.append(f"investdata_stage_seconds_sum{{{labels}}} {total:.6f}")
+    lines += [
+        "# HELP investdata_stage_seconds_max Maior tempo de cada etapa das páginas",
+        "# TYPE investdata_stage_seconds_max gauge",
+    ]
+    for (page, stage), (_, _, maximum) in sorted(stages.items()):
+        lines.append(f'investdata_stage_seconds_max{{page="{page}",stage="{stage}"}} {maximum:.6f}')
+    lines += [
+        "# HELP investdata_events_total Eventos contados, como acertos e falhas de cache",
+        "# TYPE investdata_events_total counter",
+    ]
+    for event, quantity in sorted(counters.items()):
+        lines.append(f'investdata_events_total{{event="{event}"}} {quantity}')
+    return "\n".join(lines) + "\n"
+
+# Grava as métricas num arquivo (substituição atômica, para o coletor nunca ler um arquivo pela metade)
+def write_prometheus(path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w") as file:
+        file.write(prometheus_text())
+    os.replace(temporary, path)
+
+# Painel ativado pela variável de ambiente ou pelo parâmetro ?debug=1 na URL
+def debug_enabled():
+    if os.environ.get("INVESTDATA_DEBUG") == "1":
+        return True
+    import streamlit as st
+    return st.query_params.get("debug") == "1"
+
+# Painel de depuração com os tempos desta execução e os contadores do processo
+def debug_panel(timer):
+    import streamlit as st
+
+    _, counters = snapshot()
+    with st.expander("Desempenho (depuração)"):
+        st.table({
+            'Etapa': [name for name, _ in timer.stages],
+            'Tempo (ms)': [f"{seconds * 1000:.1f}" for _, seconds in timer.stages],
+        })
+        if counters:
+            st.table({'Evento': list(counters), 'Quantidade': list(counters.values())})
@@ -0,0 +1,119 @@
+import datetime
+
+import numpy as np
+
+from investdata import bcb, rate_store
+from investdata.fixed_income import ir_rate, savings_monthly_rate
+
+# Simulação de Monte Carlo das taxas CDI, Selic e TR
+# Em vez de supor que a taxa atual se mantém durante todo o prazo, sorteia trajetórias futuras
+# reamostrando (em blocos, para manter a dinâmica de meses consecutivos) as variações mensais
+# históricas das três séries ao mesmo tempo. Os produtos são acumulados mês a mês em cada
+# trajetória, em blocos de trajetórias para manter a memória limitada.
+
+# Trajetórias simuladas por bloco, tamanho dos blocos de meses reamostrados e
+# quantidade máxima de meses guardados para o gráfico de leque
+CHUNK_SIZE = 5_000
+BLOCK_SIZE = 12
+FAN_POINTS = 60
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# Ordem das colunas das trajetórias
+SERIES_ORDER = ('cdi', 'selic', 'tr')
+
+# Primeiro mês do histórico usado por padrão e o mais antigo aceito ('AAAA-MM')
+# As séries começam antes do Plano Real (julho de 1994): as variações mensais da hiperinflação,
+# de dezenas de pontos percentuais, somadas à taxa atual fariam as trajetórias explodirem
+HISTORY_START = '2000-01'
+MIN_HISTORY_START = '1994-07'
+
+# Histórico mensal das três séries a partir do armazenamento local, desde o mês start
+# (nunca antes de MIN_HISTORY_START)
+# Retorna (meses 'AAAA-MM', array meses x 3 com as taxas em % ao mês), só com os meses completos
+# presentes nas três séries. A TR usa o primeiro valor divulgado em cada mês.
+def monthly_history(db_path=None, start=HISTORY_START):
+    start = max(start, MIN_HISTORY_START)
+    by_series = []
+    for name in SERIES_ORDER:
+        monthly = {}
+        for date, value in rate_store.load_points(bcb.SERIES[name]['code'], start_date=f'{start}-01', db_path=db_path):
+            monthly.setdefault(date[:7], value)
+        by_series.append(monthly)
+
+    current_month = datetime.date.today().strftime('%Y-%m')
+    months = sorted(month for month in set(by_series[0]).intersection(*by_series[1:]) if month < current_month)
+    history = np.array([[series[month] for series in by_series] for month in months], dtype=float)
+    return months, history.reshape(len(months), len(SERIES_ORDER))
+
+# Sorteia trajetórias futuras das taxas (em % ao mês), partindo do último mês do histórico
+# Retorna um array trajetórias x meses x 3; as taxas nunca ficam negativas
+def simulate_rate_paths(history, months, n_paths, rng, block_size=BLOCK_SIZE):
+    changes = np.diff(history, axis=0)
+    block_size = max(1, min(block_size, len(changes)))
+    n_blocks = -(-months // block_size)
+
+    # Início de cada bloco sorteado e os índices dos meses de cada bloco
+    starts = rng.integers(0, len(changes) - block_size + 1, size=(n_paths, n_blocks))
+    indices = (starts[:, :, None] + np.arange(block_size)).reshape(n_paths, -1)[:, :months]
+
+    paths = history[-1] + np.cumsum(changes[indices], axis=1)
+    return np.maximum(paths, 0.0)
+
+# Valor acumulado mês a mês com aportes no fim de cada mês, para cada trajetória
+# V_t = V_{t-1} * f_t + C  =>  V_t = G_t * (P + C * soma(1 / G_k, k = 1..t)), com G_t = produto dos fatores
+def _accumulate(initial_value, contribution_value, factors):
+    growth = np.cumprod(factors, axis=1)
+    values = growth * (initial_value + contribution_value * np.cumsum(1 / growth, axis=1))
+    return np.concatenate([np.full((len(factors), 1), float(initial_value)), values], axis=1)
+
+# Valores de cada produto (mês 0 até months) para um bloco de trajetórias
+def _simulate_products(paths, initial_value, contribution_value, cdb_rate, lci_lca_rate, cofrinho_rates):
+    cdi = paths[..., 0] / 100
+    month_range = np.arange(paths.shape[1] + 1)
+    invested = initial_value + contribution_value * month_range
+
+    cdb = _accumulate(initial_value, contribution_value, 1 + cdi * cdb_rate / 100)
+    products = {
+        'CDB': cdb - (cdb - invested) * ir_rate(month_range),  # IR sobre o lucro, conforme o prazo
+        'LCI/LCA': _accumulate(initial_value, contribution_value, 1 + cdi * lci_lca_rate / 100),
+    }
+
+    # Poupança: a regra depende da Selic anualizada de cada mês, mais a TR do mês
+    selic_annual = ((1 + paths[..., 1] / 100) ** 12 - 1) * 100
+    savings_rate = savings_monthly_rate(selic_annual, 0.0) + paths[..., 2] / 100
+    products['Poupança'] = _accumulate(initial_value, contribution_value, 1 + savings_rate)
+
+    for rate in cofrinho_rates:
+        products[f'Cofrinho {rate:g}% CDI'] = _accumulate(initial_value, contribution_value, 1 + cdi * rate / 100)
+    return products
+
+# Executa a simulação completa
+# Retorna um dicionário com os meses guardados para o gráfico, os percentis pedidos e, para cada
+# produto, um array percentis x meses guardados. A mesma seed (com o mesmo chunk_size) sempre
+# gera o mesmo resultado.
+def run_monte_carlo(history, initial_value, contribution_value, months, cdb_rate, lci_lca_rate,
+                    cofrinho_rates=(100, 102), n_paths=10_000, seed=None, chunk_size=CHUNK_SIZE,
+                    percentiles=PERCENTILES, fan_points=FAN_POINTS):
+    history = np.asarray(history, dtype=float)
+    if len(history) < 2:
+        raise ValueError("o histórico precisa de pelo menos dois meses")
+
+    rng = np.random.default_rng(seed)
+    checkpoints = np.unique(np.linspace(0, months, min(fan_points, months + 1)).round().astype(int))
+
+    # Só os meses do gráfico são guardados (em float32), para a memória não crescer com o prazo
+    stored = {}
+    for start in range(0, n_paths, chunk_size):
+        size = min(chunk_size, n_paths - start)
+        paths = simulate_rate_paths(history, months, size, rng)
+        products = _simulate_products(paths, initial_value, contribution_value, cdb_rate, lci_lca_rate, cofrinho_rates)
+        for name, values in products.items():
+            stored.setdefault(name, np.empty((n_paths, len(checkpoints)), dtype=np.float32))
+            stored[name][start:start + size] = values[:, checkpoints]
+
+    return {
+        'months': checkpoints,
+        'percentiles': tuple(percentiles),
+        'values': {name: np.percentile(values, percentiles, axis=0) for name, values in stored.items()},
+    }
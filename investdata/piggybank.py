@@ -0,0 +1,42 @@
+import numpy as np
+
+from investdata.fixed_income import _annuity
+
+# Cálculo do rendimento dos cofrinhos (percentual do CDI, sem IR)
+# calcular_cdi calcula um cenário; valor_cofrinho calcula vários cenários de uma vez com NumPy.
+
+def calcular_cdi(taxa_cdi, valor_inicial, tempo, valor_contribuicao, unidade_tempo, multiplicar_cdi): # estabelecendo os parametros da função 
+    taxa_cdi = taxa_cdi * multiplicar_cdi / 100 #convertendo para decimal
+    
+    if unidade_tempo == "Meses":   
+        anos = tempo / 12 # para converter meses em anos, divide o valor de tempo por 12 
+    else:
+        anos = tempo
+    # M = C * (1 + i)^t
+    #Conta de juros compostos 
+    valor_anual = valor_inicial * (1 + taxa_cdi) ** anos
+
+    # Valor futuro dos aportes mensais (valor futuro de anuidade ordinária) i,t = mensal
+    # VF = C * (((1 + i)^t-1) / i)
+
+    valor_mensal = (1 + taxa_cdi) ** (1 / 12) - 1
+    
+    meses = int(anos * 12)#convertendo de ano para meses
+    #valor final do aporte eh o rendimento total dos aportes mensais
+    valor_final_contribuicao = valor_contribuicao * (((1 + valor_mensal) ** meses - 1) / valor_mensal)
+    
+    # valor_anual=quanto o rendimento inicial rendeu 
+    valor_total = valor_anual + valor_final_contribuicao #soma do montante do investimento incial + aportes mensais
+    
+    
+    return valor_total
+
+# Versão vetorizada de calcular_cdi, com o tempo sempre em meses inteiros
+# Aceita arrays em qualquer parâmetro (com broadcasting do NumPy)
+def valor_cofrinho(taxa_cdi, valor_inicial, meses, valor_contribuicao, multiplicar_cdi):
+    meses = np.asarray(meses)
+    taxa_cdi = np.asarray(taxa_cdi) * np.asarray(multiplicar_cdi) / 100  # convertendo para decimal
+
+    valor_anual = valor_inicial * (1 + taxa_cdi) ** (meses / 12)  # M = C * (1 + i)^t
+    valor_mensal = (1 + taxa_cdi) ** (1 / 12) - 1
+    return valor_anual + _annuity(valor_contribuicao, valor_mensal, meses)  # montante inicial + aportes mensais
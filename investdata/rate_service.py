@@ -0,0 +1,131 @@
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from investdata import bcb, instrumentation, rate_store
+
+# Serviço de taxas compartilhado por todas as páginas e sessões do processo
+# - Uma única busca em andamento por vez: sessões que encontram o cache vazio esperam a
+#   mesma busca em vez de cada uma disparar a sua (single-flight).
+# - Valores vencidos continuam sendo servidos enquanto uma atualização roda em segundo
+#   plano (stale-while-revalidate), então a rede nunca fica no caminho de uma requisição
+#   que já tenha algum valor disponível.
+# - Na primeira chamada do processo, os valores salvos no armazenamento local são usados
+#   como ponto de partida (já vencidos), disparando a atualização em segundo plano.
+# - Quem depende das taxas (como o cache de resultados) pode se inscrever para ser avisado
+#   quando elas mudarem.
+# - Os históricos diários (backtest e simulação de cenários) seguem a mesma regra: uma atualização
+#   por série de cada vez, em segundo plano, e só quem ainda não tem o histórico salvo espera por ela.
+
+# Tempo (em segundos) em que as taxas em memória são consideradas atuais
+RATE_TTL = 15 * 60
+
+_lock = threading.Lock()
+_refresh_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rate-refresh")
+_history_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="history-refresh")
+_inflight = None
+_history_inflight = {}  # série diária -> atualização em andamento
+_rates = None  # {'cdi': ..., 'selic': ..., 'tr': ...}
+_failed = []
+_fetched_at = 0.0
+_subscribers = []
+
+# Inscreve callback() para ser chamada sempre que as taxas publicadas mudarem
+def subscribe(callback):
+    with _lock:
+        _subscribers.append(callback)
+
+def _notify():
+    with _lock:
+        subscribers = list(_subscribers)
+    for callback in subscribers:
+        callback()
+
+# Busca todas as séries e publica o resultado no cache do processo
+def _refresh():
+    global _rates, _failed, _fetched_at
+    rates, failed = bcb.fetch_rates()
+    with _lock:
+        # Não troca valores reais já conhecidos pelos valores padrão de uma busca que falhou
+        if _rates is not None:
+            for name in failed:
+                rates[name] = _rates[name]
+            failed = [name for name in failed if name in _failed]
+        changed = rates != _rates
+        _rates, _failed, _fetched_at = rates, failed, time.time()
+    if changed:
+        _notify()
+    return rates, failed
+
+# Dispara a atualização, ou devolve a que já está em andamento
+def _start_refresh():
+    global _inflight
+    with _lock:
+        if _inflight is None or _inflight.done():
+            _inflight = _refresh_executor.submit(_refresh)
+        return _inflight
+
+# Preenche o cache com os valores do armazenamento local, marcados como vencidos
+def _load_stored():
+    global _rates, _failed, _fetched_at
+    try:
+        rates = {name: bcb.stored_rate(name) for name in bcb.SERIES}
+    except (sqlite3.Error, ValueError, IndexError):
+        return False
+    with _lock:
+        if _rates is None:
+            _rates, _failed, _fetched_at = rates, [], 0.0
+    return True
+
+# Taxas atuais: retorna (taxas, falhas), como bcb.fetch_rates
+# Só bloqueia quando ainda não existe nenhum valor disponível no processo nem no armazenamento local
+def get_rates(names=tuple(bcb.SERIES), ttl=RATE_TTL):
+    if _rates is None:
+        if _load_stored():
+            instrumentation.count('rate_cache_store')
+        else:
+            instrumentation.count('rate_cache_miss')
+            _start_refresh().result()
+
+    with _lock:
+        rates, failed, fetched_at = _rates, _failed, _fetched_at
+    if time.time() - fetched_at >= ttl:
+        instrumentation.count('rate_cache_stale')
+        _start_refresh()
+    else:
+        instrumentation.count('rate_cache_hit')
+
+    return {name: rates[name] for name in names}, [name for name in failed if name in names]
+
+# Descarta as taxas em memória (a próxima chamada volta a partir do armazenamento local ou da API)
+def clear():
+    global _rates, _failed, _fetched_at
+    # Espera a atualização em andamento, para ela não repor os valores descartados
+    inflight = _inflight
+    if inflight is not None:
+        inflight.result()
+    with _lock:
+        _rates, _failed, _fetched_at = None, [], 0.0
+    _notify()
+
+# Dispara a atualização do histórico diário name (de bcb.DAILY_SERIES), ou devolve a que já está em andamento
+def _start_history_refresh(name):
+    series = bcb.DAILY_SERIES[name]
+    with _lock:
+        inflight = _history_inflight.get(name)
+        if inflight is None or inflight.done():
+            inflight = _history_executor.submit(bcb.update_series, series['code'], first_date=series['first_date'])
+            _history_inflight[name] = inflight
+        return inflight
+
+# Mantém o histórico diário atualizado sem colocar a rede no caminho da página: com o histórico já
+# salvo, a atualização roda em segundo plano (update_series não chama a API se a série salva for
+# recente); sem ele, espera o download e propaga os erros dele
+def refresh_history(name):
+    inflight = _start_history_refresh(name)
+    if rate_store.history_start(bcb.DAILY_SERIES[name]['code']) is not None:
+        instrumentation.count('history_background')
+        return
+    instrumentation.count('history_blocking')
+    inflight.result()
@@ -0,0 +1,112 @@
+import os
+import sqlite3
+import time
+
+# Armazenamento local das séries do Banco Central em SQLite
+# Cada ponto é guardado por (código da série, data), então uma atualização só precisa
+# trazer as datas a partir do último ponto salvo. Os dados continuam disponíveis quando
+# a API está fora do ar ou o processo é reiniciado.
+
+# Caminho padrão do banco (pode ser trocado pela variável de ambiente INVESTDATA_RATE_DB)
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "rates.sqlite")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS series_points (
+    code INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (code, date)
+);
+CREATE TABLE IF NOT EXISTS series_meta (
+    code INTEGER PRIMARY KEY,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS series_history (
+    code INTEGER PRIMARY KEY,
+    first_date TEXT NOT NULL
+);
+"""
+
+def get_db_path():
+    return os.environ.get("INVESTDATA_RATE_DB", DEFAULT_DB_PATH)
+
+# Abre uma conexão nova (barato no SQLite e seguro entre threads) e garante as tabelas
+def connect(db_path=None):
+    db_path = db_path or get_db_path()
+    directory = os.path.dirname(db_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    connection = sqlite3.connect(db_path, timeout=10)
+    connection.executescript(_SCHEMA)
+    return connection
+
+# Grava (ou substitui) os pontos de uma série; rows = [(data ISO, valor), ...]
+# history_start: data ISO a partir da qual o histórico inteiro da série foi baixado (ver history_start)
+def save_points(code, rows, db_path=None, history_start=None):
+    connection = connect(db_path)
+    try:
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO series_points (code, date, value) VALUES (?, ?, ?)",
+                [(code, date, value) for date, value in rows],
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO series_meta (code, updated_at) VALUES (?, ?)",
+                (code, time.time()),
+            )
+            if history_start is not None:
+                connection.execute(
+                    "INSERT OR REPLACE INTO series_history (code, first_date) VALUES (?, ?)",
+                    (code, history_start),
+                )
+    finally:
+        connection.close()
+
+# Pontos de uma série em ordem cronológica, opcionalmente a partir de uma data
+def load_points(code, start_date=None, db_path=None):
+    connection = connect(db_path)
+    try:
+        if start_date is None:
+            cursor = connection.execute(
+                "SELECT date, value FROM series_points WHERE code = ? ORDER BY date", (code,))
+        else:
+            cursor = connection.execute(
+                "SELECT date, value FROM series_points WHERE code = ? AND date >= ? ORDER BY date",
+                (code, start_date))
+        return cursor.fetchall()
+    finally:
+        connection.close()
+
+# Somente os valores de uma série, em ordem cronológica
+def load_values(code, db_path=None):
+    return [value for _, value in load_points(code, db_path=db_path)]
+
+# Data ISO do último ponto salvo de uma série (None se a série ainda não foi baixada)
+def last_date(code, db_path=None):
+    connection = connect(db_path)
+    try:
+        row = connection.execute(
+            "SELECT MAX(date) FROM series_points WHERE code = ?", (code,)).fetchone()
+        return row[0]
+    finally:
+        connection.close()
+
+# Momento (epoch) da última atualização bem sucedida de uma série
+def updated_at(code, db_path=None):
+    connection = connect(db_path)
+    try:
+        row = connection.execute(
+            "SELECT updated_at FROM series_meta WHERE code = ?", (code,)).fetchone()
+        return row[0] if row else None
+    finally:
+        connection.close()
+
+# Data ISO a partir da qual o histórico inteiro de uma série foi baixado (None se só há pontos recentes ou nenhum)
+def history_start(code, db_path=None):
+    connection = connect(db_path)
+    try:
+        row = connection.execute(
+            "SELECT first_date FROM series_history WHERE code = ?", (code,)).fetchone()
+        return row[0] if row else None
+    finally:
+        connection.close()
@@ -0,0 +1,76 @@
+import datetime
+import os
+import threading
+from collections import OrderedDict
+
+from investdata import instrumentation, rate_service
+
+# Cache de resultados compartilhado por todas as sessões do processo
+# Guarda o resultado de uma simulação (as séries calculadas e o gráfico já montado) pela chave
+# (página, entradas normalizadas, taxas usadas). Entradas iguais vindas de qualquer sessão reaproveitam
+# o mesmo resultado sem recalcular nem remontar o gráfico. O cache tem tamanho máximo, descarta o
+# item usado há mais tempo (LRU) e é esvaziado sempre que o serviço de taxas publica taxas novas.
+#
+# Os valores guardados são compartilhados entre as sessões e não devem ser alterados por quem os recebe.
+
+# Quantidade máxima de resultados guardados (INVESTDATA_RESULT_CACHE_SIZE; 0 desativa o cache)
+MAX_ENTRIES = int(os.environ.get("INVESTDATA_RESULT_CACHE_SIZE", 128))
+
+# Casas decimais consideradas ao comparar números das entradas
+DECIMALS = 8
+
+_lock = threading.Lock()
+_entries = OrderedDict()
+
+# Converte as entradas numa chave estável: números arredondados, datas em ISO, sequências em tuplas
+# e dicionários em tuplas ordenadas de pares, de modo que 1000, 1000.0 e np.float64(1000) coincidam
+def normalize(value):
+    if isinstance(value, dict):
+        return tuple(sorted((str(key), normalize(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize(item) for item in value)
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, (str, bool)) or value is None:
+        return value
+    if hasattr(value, 'item'):  # escalares do NumPy
+        value = value.item()
+    if isinstance(value, (int, float)):
+        value = round(float(value), DECIMALS)
+        return 0.0 if value == 0 else value  # -0.0 e 0.0 na mesma chave
+    return value
+
+# Resultado guardado para as entradas ou, se não houver, o resultado de compute(), que passa a ser guardado
+# rates: as taxas (ou qualquer versão dos dados de mercado) usadas no cálculo, que fazem parte da chave
+def get_or_compute(page, inputs, rates, compute):
+    key = (page, normalize(inputs), normalize(rates))
+    with _lock:
+        if key in _entries:
+            _entries.move_to_end(key)
+            instrumentation.count('result_cache_hit')
+            return _entries[key]
+
+    instrumentation.count('result_cache_miss')
+    value = compute()
+    if MAX_ENTRIES <= 0:
+        return value
+    with _lock:
+        _entries[key] = value
+        _entries.move_to_end(key)
+        while len(_entries) > MAX_ENTRIES:
+            _entries.popitem(last=False)
+            instrumentation.count('result_cache_evict')
+    return value
+
+# Quantidade de resultados guardados
+def size():
+    with _lock:
+        return len(_entries)
+
+# Esvazia o cache
+def clear():
+    with _lock:
+        _entries.clear()
+
+# Taxas novas invalidam tudo o que foi calculado com as anteriores
+rate_service.subscribe(clear)
@@ -0,0 +1,99 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from investdata.fixed_income import cdb_value, lci_lca_value, savings_value
+from investdata.piggybank import valor_cofrinho
+
+# Varredura de parâmetros: avalia todos os cenários de uma grade (produto cartesiano de
+# valores iniciais, aportes mensais, prazos e rentabilidades do CDB) de uma vez.
+# A grade é dividida em blocos avaliados com NumPy; grades grandes distribuem os blocos
+# entre processos, iniciados do zero (spawn): um fork do servidor do Streamlit copiaria as
+# threads dele no meio do que estiverem fazendo e poderia travar os processos filhos.
+
+# Tamanho de cada bloco (em cenários) e a partir de quantos cenários usar vários processos
+CHUNK_SIZE = 250_000
+PROCESS_THRESHOLD = 2_000_000
+
+# Produtos comparados, na ordem usada pelo array "best"
+PRODUCTS = ('CDB', 'LCI/LCA', 'Poupança', 'Cofrinho')
+
+# Eixos da grade, na ordem das dimensões dos resultados
+AXES = ('initial_value', 'contribution_value', 'months', 'cdb_rate')
+
+# Número de iterações da bisseção usada no ponto de equilíbrio (precisão bem abaixo de 0,01% do CDI)
+BREAK_EVEN_ITERATIONS = 60
+BREAK_EVEN_MAX_RATE = 1000.0
+
+# Avalia um bloco da grade: cenários de índice start até stop (no array achatado)
+def _evaluate_chunk(axes, rates, start, stop):
+    shape = tuple(len(axis) for axis in axes)
+    i, j, k, l = np.unravel_index(np.arange(start, stop), shape)
+    initial_value, contribution_value = axes[0][i], axes[1][j]
+    months, cdb_rate = axes[2][k], axes[3][l]
+
+    values = np.empty((len(PRODUCTS), stop - start))
+    values[0] = cdb_value(initial_value, cdb_rate, rates['cdi'], months, contribution_value)
+    values[1] = lci_lca_value(initial_value, rates['lci_lca'], rates['cdi'], months, contribution_value)
+    values[2] = savings_value(initial_value, rates['selic'], months, contribution_value, rates['tr'])
+    values[3] = valor_cofrinho(rates['cdi'], initial_value, months, contribution_value, rates['cofrinho'])
+    return values
+
+# Rentabilidade do CDB (% do CDI) que, já descontado o IR, empata com o valor alvo
+# Bisseção vetorizada: todos os cenários avançam juntos; NaN quando o prazo é zero
+def break_even_cdb_rate(initial_value, contribution_value, months, cdi_rate, target_value):
+    initial_value, contribution_value, months, target_value = np.broadcast_arrays(
+        initial_value, contribution_value, months, target_value)
+    low = np.zeros(target_value.shape)
+    high = np.full(target_value.shape, BREAK_EVEN_MAX_RATE)
+    for _ in range(BREAK_EVEN_ITERATIONS):
+        middle = (low + high) / 2
+        below = cdb_value(initial_value, middle, cdi_rate, months, contribution_value) < target_value
+        low = np.where(below, middle, low)
+        high = np.where(below, high, middle)
+    rate = (low + high) / 2
+    return np.where(months > 0, rate, np.nan)
+
+# Avalia a grade inteira
+# Retorna um dicionário com os eixos, o valor final de cada produto (arrays com uma dimensão
+# por eixo), o índice do melhor produto em cada cenário e, para cada valor inicial, aporte e
+# prazo, a rentabilidade do CDB que empata com a LCI/LCA e com a poupança.
+# processes: None decide pelo tamanho da grade, 0 força um único processo
+def run_sweep(initial_values, contribution_values, months, cdb_rates, cdi_rate, lci_lca_rate, selic_rate, ref_rate,
+              cofrinho_multiplier=1.0, chunk_size=CHUNK_SIZE, processes=None):
+    axes = tuple(np.atleast_1d(np.asarray(axis, dtype=float)) for axis in
+                 (initial_values, contribution_values, months, cdb_rates))
+    axes = (axes[0], axes[1], axes[2].astype(int), axes[3])
+    rates = {'cdi': cdi_rate, 'lci_lca': lci_lca_rate, 'selic': selic_rate, 'tr': ref_rate, 'cofrinho': cofrinho_multiplier}
+
+    shape = tuple(len(axis) for axis in axes)
+    total = int(np.prod(shape))
+    bounds = [(start, min(start + chunk_size, total)) for start in range(0, total, chunk_size)]
+
+    if processes is None:
+        processes = os.cpu_count() if total >= PROCESS_THRESHOLD else 0
+    if processes and len(bounds) > 1:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=processes, mp_context=context) as executor:
+            chunks = list(executor.map(_evaluate_chunk, *zip(*[(axes, rates, start, stop) for start, stop in bounds])))
+    else:
+        chunks = [_evaluate_chunk(axes, rates, start, stop) for start, stop in bounds]
+
+    values = np.concatenate(chunks, axis=1) if chunks else np.empty((len(PRODUCTS), 0))
+    values = values.reshape((len(PRODUCTS),) + shape)
+
+    # Os pontos de equilíbrio não dependem da rentabilidade do CDB, então usam a primeira fatia dessa dimensão
+    initial_value, contribution_value, month = np.meshgrid(axes[0], axes[1], axes[2], indexing='ij')
+    break_even = {
+        'LCI/LCA': break_even_cdb_rate(initial_value, contribution_value, month, cdi_rate, values[1][..., 0]),
+        'Poupança': break_even_cdb_rate(initial_value, contribution_value, month, cdi_rate, values[2][..., 0]),
+    }
+
+    return {
+        'axes': dict(zip(AXES, axes)),
+        'values': dict(zip(PRODUCTS, values)),
+        'best': np.argmax(values, axis=0),
+        'break_even': break_even,
+    }
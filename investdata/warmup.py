@@ -0,0 +1,64 @@
+import importlib
+import json
+import os
+import threading
+import time
+
+from investdata import instrumentation
+
+# Pré-aquecimento do processo
+# As páginas importam as bibliotecas pesadas só quando uma simulação roda, então o primeiro usuário
+# de cada processo paga essas importações. Com INVESTDATA_PREWARM=1, a primeira execução do app
+# dispara em segundo plano a importação de tudo e a primeira busca das taxas, e a página em si
+# abre sem esperar por isso.
+
+HEAVY_MODULES = (
+    'numpy',
+    'pandas',
+    'plotly.express',
+    'plotly.graph_objects',
+    'matplotlib.figure',
+    'requests',
+    'investdata.fixed_income',
+    'investdata.piggybank',
+    'investdata.fii',
+    'investdata.charts',
+    'investdata.sweep',
+    'investdata.montecarlo',
+    'investdata.backtest',
+)
+
+_lock = threading.Lock()
+_thread = None
+
+# Importa os módulos e busca as taxas; retorna o tempo (em segundos) de cada etapa
+def prewarm(modules=HEAVY_MODULES, rates=True):
+    timings = {}
+    for module in modules:
+        start = time.perf_counter()
+        importlib.import_module(module)
+        timings[module] = time.perf_counter() - start
+
+    if rates:
+        from investdata import rate_service
+
+        start = time.perf_counter()
+        rate_service.get_rates()
+        timings['rates'] = time.perf_counter() - start
+
+    for stage, seconds in timings.items():
+        instrumentation.record_stage('prewarm', stage, seconds)
+        instrumentation.logger.info(json.dumps({'page': 'prewarm', 'stage': stage, 'seconds': round(seconds, 6)}))
+    return timings
+
+# Dispara o pré-aquecimento em segundo plano uma única vez por processo, se ativado
+# Retorna a thread do pré-aquecimento (ou None, se desativado)
+def start_prewarm():
+    global _thread
+    if os.environ.get("INVESTDATA_PREWARM") != "1":
+        return None
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=prewarm, name="investdata-prewarm", daemon=True)
+            _thread.start()
+    return _thread
@@ -0,0 +1,94 @@
+import streamlit as st
+import numpy as np
+import datetime
+
+from investdata import instrumentation, rate_service, result_cache
+from investdata.backtest import contribution_schedule, load_index, lot_values, value_curve
+
+# Pandas e Plotly só são importados quando a simulação roda
+
+# Medição das etapas desta execução da página
+timer = instrumentation.start_page('backtest')
+
+# Cabeçalho da página
+st.title("Backtest Histórico")
+st.write("Descubra quanto um investimento atrelado ao CDI teria rendido entre duas datas do passado, usando as taxas diárias reais divulgadas pelo Banco Central.")
+
+# Garante que o histórico diário do CDI está salvo localmente: só a primeira vez (sem nada salvo)
+# espera o download da série inteira; depois, a atualização roda em segundo plano
+try:
+    with st.spinner("Atualizando o histórico diário do CDI..."), timer.stage('fetch'):
+        rate_service.refresh_history('cdi_daily')
+except OSError:  # erros de rede do requests (importado só quando a API é chamada) derivam de OSError
+    st.error("Erro ao atualizar o histórico do CDI. Usando os dados já salvos.")
+
+try:
+    cdi_index = load_index('cdi_daily')
+except ValueError:
+    st.error("O histórico diário do CDI ainda não está disponível. Tente novamente mais tarde.")
+    st.stop()
+
+first_day = cdi_index.dates[0].astype(datetime.date)
+last_day = cdi_index.dates[-1].astype(datetime.date)
+st.markdown(f"<h6 style='text-align: center; margin: 20px;'>Histórico disponível: {first_day:%d/%m/%Y} a {last_day:%d/%m/%Y}</h6>", unsafe_allow_html=True)
+
+# Inputs do usuário
+col1, col2 = st.columns(2)
+with col1:
+    start_date = st.date_input("Data da Aplicação", value=max(first_day, last_day - datetime.timedelta(days=5 * 365)), min_value=first_day, max_value=last_day, format="DD/MM/YYYY")
+    investment_value = st.number_input("Investimento Inicial (R$)", value=1000.0, min_value=0.0, step=100.0)
+    cdb_rentability = st.number_input("Rentabilidade do CDB (% do CDI)", value=110.0, min_value=0.0, max_value=300.0, step=5.0)
+with col2:
+    end_date = st.date_input("Data do Resgate", value=last_day, min_value=first_day, max_value=last_day, format="DD/MM/YYYY")
+    monthly_contribution = st.number_input("Aporte Mensal (R$)", step=100.0)
+    lci_lca_rentability = st.number_input("Rentabilidade da LCI/LCA (% do CDI)", value=90.0, min_value=0.0, max_value=300.0, step=5.0)
+
+# Calcula o backtest e monta a tabela de resultados e o gráfico
+def build_backtest():
+    import pandas as pd
+    import plotly.express as px
+
+    with timer.stage('compute'):
+        dates, amounts = contribution_schedule(start_date, end_date, investment_value, monthly_contribution)
+        products = {
+            'CDB': (load_index('cdi_daily', cdb_rentability), True),
+            'LCI/LCA': (load_index('cdi_daily', lci_lca_rentability), False),
+        }
+        invested = amounts.sum()
+
+        # Resultado final de cada investimento (CDB com IR calculado pelo prazo de cada aporte)
+        final_values = [lot_values(index, dates, amounts, end_date, taxed).sum() for index, taxed in products.values()]
+
+        # Evolução mês a mês da carteira
+        eval_dates = np.append(np.arange(np.datetime64(start_date, 'M') + 1, np.datetime64(end_date, 'M') + 1).astype('datetime64[D]'), np.datetime64(end_date, 'D'))
+        curves = {product: value_curve(index, dates, amounts, eval_dates, taxed) for product, (index, taxed) in products.items()}
+
+    with timer.stage('frame'):
+        result_df = pd.DataFrame({
+            'Tipo de Investimento': list(products),
+            'Total Aportado (R$)': [invested] * len(products),
+            'Lucro Final (R$)': [value - invested for value in final_values],
+            'Valor Total (R$)': final_values,
+        })
+        graph_df = pd.DataFrame({'Data': eval_dates, **curves})
+
+    with timer.stage('chart'):
+        fig = px.line(graph_df, x='Data', y=list(products), labels={'value': 'Valor (R$)', 'variable': 'Tipo de Investimento'})
+    return result_df, fig
+
+if st.button("Simular Backtest", use_container_width=True, disabled=end_date <= start_date):
+    # O histórico entra na chave pelo último dia e pelo índice acumulado até ele, então uma série
+    # atualizada ou revisada não reaproveita resultados antigos
+    result_df, fig = result_cache.get_or_compute(
+        'backtest',
+        {'start_date': start_date, 'end_date': end_date, 'initial_value': investment_value,
+         'contribution_value': monthly_contribution, 'cdb_rate': cdb_rentability, 'lci_lca_rate': lci_lca_rentability},
+        {'cdi_daily': (last_day, float(cdi_index.index[-1]))},
+        build_backtest,
+    )
+
+    with timer.stage('render'):
+        st.dataframe(result_df.style.format({col: "{:.2f}" for col in result_df.select_dtypes(include='number').columns}), use_container_width=False)
+        st.plotly_chart(fig, use_container_width=True, theme=None)
+
+timer.finish()
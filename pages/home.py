@@ -11,3 +11,6 @@ st.header("Comece agora mesmo!")
 st.page_link("./pages/custom.py", label="Simular Ativo Personalizado", icon="💰")
 st.page_link("./pages/piggybank.py", label="Simular Cofrinhos Populares", icon="🐷")
 st.page_link("./pages/fii.py", label="Simular Renda fundo Imobiliario", icon="📊")
+st.page_link("./pages/sweep.py", label="Comparar cenários em grade", icon="🧮")
+st.page_link("./pages/montecarlo.py", label="Simular cenários de juros", icon="🎲")
+st.page_link("./pages/backtest.py", label="Fazer um backtest histórico", icon="⏳")
@@ -0,0 +1,102 @@
+import streamlit as st
+
+import datetime
+import hashlib
+
+from investdata import instrumentation, rate_service, result_cache
+from investdata.montecarlo import HISTORY_START, MIN_HISTORY_START, monthly_history, run_monte_carlo
+
+# Pandas e Plotly só são importados quando há um resultado para mostrar
+
+# Medição das etapas desta execução da página
+timer = instrumentation.start_page('montecarlo')
+
+# Cabeçalho da página
+st.title("Simulador de Cenários de Juros")
+st.write("Em vez de supor que o CDI de hoje dura o prazo inteiro, simule milhares de trajetórias futuras de CDI, Selic e TR sorteadas a partir do histórico do Banco Central e veja a faixa de resultados de cada investimento.")
+
+# Início do histórico reamostrado (nunca antes do Plano Real, cujas variações mensais explodiriam as trajetórias)
+history_start_year = st.number_input("Histórico a partir do ano", value=int(HISTORY_START[:4]),
+                                     min_value=int(MIN_HISTORY_START[:4]), max_value=datetime.date.today().year - 2, step=1)
+history_start = max(f"{history_start_year}-01", MIN_HISTORY_START)
+
+# Garante que o histórico local já foi baixado antes de montar as trajetórias: CDI e Selic mensais
+# vêm com as taxas; a TR diária desde o Plano Real só é esperada na primeira vez (sem o histórico salvo)
+# e, depois, é atualizada em segundo plano
+try:
+    with st.spinner("Atualizando o histórico das taxas..."), timer.stage('fetch'):
+        rate_service.get_rates()
+        rate_service.refresh_history('tr_daily')
+except OSError:  # erros de rede do requests (importado só quando a API é chamada) derivam de OSError
+    st.error("Erro ao atualizar o histórico da TR. Usando os dados já salvos.")
+history_months, history = monthly_history(start=history_start)
+if len(history) < 24:
+    st.error("Histórico insuficiente das taxas do Banco Central para a simulação. Tente novamente mais tarde.")
+    st.stop()
+st.markdown(f"<h6 style='text-align: center; margin: 20px;'>Histórico usado: {history_months[0]} a {history_months[-1]} ({len(history)} meses, a partir de {history_start})</h6>", unsafe_allow_html=True)
+
+# Inputs do usuário
+col1, col2 = st.columns(2)
+with col1:
+    investment_value = st.number_input("Investimento Inicial (R$)", value=1000.0, min_value=0.0, step=100.0)
+    duration_value = st.number_input("Prazo (meses)", value=60, min_value=1, max_value=600, step=12)
+    cdb_rentability = st.number_input("Rentabilidade do CDB (% do CDI)", value=100.0, min_value=0.0, max_value=300.0, step=10.0)
+    n_paths = st.number_input("Quantidade de trajetórias", value=10000, min_value=100, max_value=200000, step=1000)
+with col2:
+    monthly_contribution = st.number_input("Aporte Mensal (R$)", step=100.0)
+    lci_lca_rentability = st.number_input("Rentabilidade da LCI/LCA (% do CDI)", value=85.0, min_value=0.0, max_value=300.0, step=10.0)
+    seed = st.number_input("Semente aleatória", value=42, min_value=0, step=1)
+
+# Entradas da simulação e versão do histórico usado (o resultado é determinístico dada a semente)
+inputs = {'initial_value': investment_value, 'contribution_value': monthly_contribution, 'months': duration_value,
+          'cdb_rate': cdb_rentability, 'lci_lca_rate': lci_lca_rentability, 'n_paths': n_paths, 'seed': seed}
+history_version = {'history': hashlib.sha1(history.tobytes()).hexdigest()}
+
+if st.button("Simular Cenários", use_container_width=True):
+    def simulate():
+        with timer.stage('compute'):
+            return run_monte_carlo(history, investment_value, monthly_contribution, duration_value,
+                                   cdb_rentability, lci_lca_rentability, n_paths=n_paths, seed=seed)
+
+    # Mesmas entradas, mesma semente e mesmo histórico reaproveitam a simulação de qualquer sessão
+    st.session_state['montecarlo'] = (inputs, history_version, result_cache.get_or_compute('montecarlo', inputs, history_version, simulate))
+
+if 'montecarlo' in st.session_state:
+    import pandas as pd
+    import plotly.graph_objects as go
+
+    result_inputs, result_version, result = st.session_state['montecarlo']
+    percentiles = result['percentiles']
+    low, q1, median, q3, high = range(len(percentiles))
+
+    # Tabela com os percentis do valor final de cada investimento
+    st.dataframe(pd.DataFrame(
+        {f'P{p} (R$)': [values[i, -1] for values in result['values'].values()] for i, p in enumerate(percentiles)},
+        index=pd.Index(list(result['values']), name='Tipo de Investimento'),
+    ).style.format("{:.2f}"), use_container_width=False)
+
+    # Gráfico de leque: mediana e faixas entre os percentis de cada investimento escolhido
+    products = st.multiselect("Investimentos no gráfico", list(result['values']), default=['CDB', 'LCI/LCA', 'Poupança'])
+
+    # Gráfico de leque montado para a simulação e os investimentos escolhidos (também guardado no cache)
+    def build_chart():
+        fig = go.Figure()
+        for product in products:
+            values = result['values'][product]
+            for lower, upper, opacity in ((low, high, 0.15), (q1, q3, 0.3)):
+                fig.add_trace(go.Scatter(x=result['months'], y=values[upper], mode='lines', line=dict(width=0),
+                                         legendgroup=product, showlegend=False, hoverinfo='skip'))
+                fig.add_trace(go.Scatter(x=result['months'], y=values[lower], mode='lines', line=dict(width=0),
+                                         fill='tonexty', opacity=opacity, legendgroup=product, showlegend=False,
+                                         name=f'{product} P{percentiles[lower]}-P{percentiles[upper]}'))
+            fig.add_trace(go.Scatter(x=result['months'], y=values[median], mode='lines', legendgroup=product,
+                                     name=f'{product} (mediana)'))
+        fig.update_layout(xaxis_title='Mês', yaxis_title='Valor Final (R$)')
+        return fig
+
+    with timer.stage('chart'):
+        fig = result_cache.get_or_compute('montecarlo_chart', {**result_inputs, 'products': products}, result_version, build_chart)
+    with timer.stage('render'):
+        st.plotly_chart(fig, use_container_width=True, theme=None)
+
+timer.finish()
@@ -0,0 +1,102 @@
+import streamlit as st
+import numpy as np
+
+from investdata import instrumentation, rate_service
+from investdata.sweep import PRODUCTS, run_sweep
+
+# Pandas e Plotly só são importados quando há um resultado para mostrar
+
+# Medição das etapas desta execução da página
+timer = instrumentation.start_page('sweep')
+
+# Cabeçalho da página
+st.title("Comparador em Grade")
+st.write("Avalie de uma só vez todas as combinações de investimento inicial, aporte mensal, prazo e rentabilidade do CDB, e descubra a partir de qual % do CDI o CDB empata com a LCI/LCA e com a Poupança.")
+
+# Taxas atuais
+with timer.stage('fetch'):
+    rates, failed = rate_service.get_rates(('cdi', 'selic', 'tr'))
+if failed:
+    st.error("Erro ao obter algumas taxas do Banco Central. Usando valores padrão.")
+cdi, selic, tr = rates['cdi'], rates['selic'], rates['tr']
+st.markdown(f"<h6 style='text-align: center; margin: 20px;'>CDI: {round(cdi, 3)}% | Selic: {round(selic, 3)}% | TR: {round(tr, 3)}%</h6>", unsafe_allow_html=True)
+
+# Entrada de um intervalo (mínimo, máximo e passo) e o array de valores correspondente
+def range_input(label, minimum, maximum, step, key):
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        low = st.number_input(f"{label} - mínimo", value=minimum, min_value=0.0, step=step, key=f"{key}_min")
+    with col2:
+        high = st.number_input(f"{label} - máximo", value=maximum, min_value=0.0, step=step, key=f"{key}_max")
+    with col3:
+        step = st.number_input(f"{label} - passo", value=step, min_value=0.01, step=step, key=f"{key}_step")
+    return np.arange(low, high + step / 2, step)
+
+# Inputs do usuário
+initial_values = range_input("Investimento Inicial (R$)", 1000.0, 100000.0, 1000.0, "initial")
+contribution_values = range_input("Aporte Mensal (R$)", 0.0, 5000.0, 500.0, "contribution")
+months = range_input("Prazo (meses)", 6.0, 360.0, 6.0, "months").astype(int)
+cdb_rates = range_input("Rentabilidade do CDB (% do CDI)", 80.0, 150.0, 5.0, "cdb")
+
+col1, col2 = st.columns(2)
+with col1:
+    lci_lca_rate = st.number_input("Rentabilidade da LCI/LCA (% do CDI)", value=85.0, min_value=0.0, max_value=300.0, step=5.0)
+with col2:
+    cofrinho_rate = st.number_input("Rentabilidade do Cofrinho (% do CDI)", value=100.0, min_value=0.0, max_value=300.0, step=1.0)
+
+total = len(initial_values) * len(contribution_values) * len(months) * len(cdb_rates)
+st.write(f"Cenários na grade: {total:,}".replace(",", "."))
+
+if st.button("Gerar Grade", use_container_width=True, disabled=total == 0):
+    with timer.stage('compute'):
+        result = run_sweep(initial_values, contribution_values, months, cdb_rates,
+                           cdi, lci_lca_rate, selic, tr, cofrinho_multiplier=cofrinho_rate / 100)
+    # A sessão guarda só o que a página exibe: os valores de cada cenário e o melhor produto de cada um
+    # ocupariam centenas de MB por sessão aberta em grades com milhões de cenários
+    st.session_state['sweep'] = {
+        'axes': result['axes'],
+        'wins': np.bincount(result['best'].ravel(), minlength=len(PRODUCTS)),
+        'break_even': result['break_even'],
+    }
+
+if 'sweep' in st.session_state:
+    import pandas as pd
+    import plotly.express as px
+
+    result = st.session_state['sweep']
+    axes = result['axes']
+
+    # Quantas vezes cada produto foi o melhor investimento da grade
+    wins = result['wins']
+    st.subheader("Melhor investimento por cenário")
+    st.dataframe(pd.DataFrame({
+        'Tipo de Investimento': PRODUCTS,
+        'Cenários em que é o melhor': wins,
+        'Percentual (%)': 100 * wins / wins.sum(),
+    }).style.format({'Percentual (%)': "{:.2f}"}), use_container_width=False)
+
+    # Mapa de calor do ponto de equilíbrio para um aporte mensal escolhido
+    st.subheader("Ponto de equilíbrio do CDB (% do CDI)")
+    col1, col2 = st.columns(2)
+    with col1:
+        target = st.selectbox("Comparar com", list(result['break_even']))
+    with col2:
+        contribution_index = st.selectbox("Aporte Mensal (R$)", range(len(axes['contribution_value'])),
+                                          format_func=lambda i: f"{axes['contribution_value'][i]:,.2f}")
+
+    break_even = result['break_even'][target][:, contribution_index, :]
+    with timer.stage('chart'):
+        fig = px.imshow(break_even, x=axes['months'], y=axes['initial_value'], aspect='auto', origin='lower',
+                        color_continuous_scale='RdYlGn_r',
+                        labels={'x': 'Prazo (meses)', 'y': 'Investimento Inicial (R$)', 'color': '% do CDI'})
+    with timer.stage('render'):
+        st.plotly_chart(fig, use_container_width=True, theme=None)
+
+    # Tabela com o ponto de equilíbrio por prazo (menor e maior valor entre os investimentos iniciais)
+    st.dataframe(pd.DataFrame({
+        'Prazo (meses)': axes['months'],
+        'Mínimo (% do CDI)': np.nanmin(break_even, axis=0),
+        'Máximo (% do CDI)': np.nanmax(break_even, axis=0),
+    }).style.format({'Mínimo (% do CDI)': "{:.2f}", 'Máximo (% do CDI)': "{:.2f}"}), use_container_width=False)
+
+timer.finish()
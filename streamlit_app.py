@@ -1,16 +1,24 @@
 import streamlit as st
 
+from investdata import warmup
+
+# Com INVESTDATA_PREWARM=1, importa as bibliotecas pesadas em segundo plano já na primeira execução
+warmup.start_prewarm()
+
 # Definição das páginas
 home_page = st.Page("./pages/home.py", title="O que é o InvestData?", icon="🏠")
 custom_page = st.Page("./pages/custom.py", title="Renda Fixa", icon="💰")
 piggybank_page = st.Page("./pages/piggybank.py", title="Cofrinhos", icon="🐷")
 fii_page = st.Page("./pages/fii.py", title="Fundos Imobiliários", icon="📊")
+sweep_page = st.Page("./pages/sweep.py", title="Comparador em Grade", icon="🧮")
+montecarlo_page = st.Page("./pages/montecarlo.py", title="Cenários de Juros", icon="🎲")
+backtest_page = st.Page("./pages/backtest.py", title="Backtest Histórico", icon="⏳")
 
 
 # Configuração da navegação entre páginas
 pg = st.navigation({
     "Bem-vindo (a)": [home_page],
-    "Simuladores": [custom_page, piggybank_page, fii_page]
+    "Simuladores": [custom_page, piggybank_page, fii_page, sweep_page, montecarlo_page, backtest_page]
     
 })
 
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from investdata.business_days import default_calendar, easter
+
+# Feriados nacionais em dias de semana, conferidos no calendário de cada ano
+WEEKDAY_HOLIDAYS = {
+    2023: ['2023-02-20', '2023-02-21', '2023-04-07', '2023-04-21', '2023-05-01', '2023-06-08',
+           '2023-09-07', '2023-10-12', '2023-11-02', '2023-11-15', '2023-12-25'],
+    2024: ['2024-01-01', '2024-02-12', '2024-02-13', '2024-03-29', '2024-05-01', '2024-05-30',
+           '2024-11-15', '2024-11-20', '2024-12-25'],
+    2025: ['2025-01-01', '2025-03-03', '2025-03-04', '2025-04-18', '2025-04-21', '2025-05-01',
+           '2025-06-19', '2025-11-20', '2025-12-25'],
+}
+
+def _weekdays(year):
+    days = np.arange(np.datetime64(f'{year}-01-01'), np.datetime64(f'{year + 1}-01-01'))
+    return days[(days.astype(np.int64) + 3) % 7 < 5]
+
+@pytest.mark.parametrize('year, expected', [(2023, 249), (2024, 253), (2025, 252)])
+def test_business_days_per_year(year, expected):
+    calendar = default_calendar()
+    assert calendar.business_days(f'{year}-01-01', f'{year + 1}-01-01') == expected
+    assert expected == len(_weekdays(year)) - len(WEEKDAY_HOLIDAYS[year])
+
+@pytest.mark.parametrize('year', sorted(WEEKDAY_HOLIDAYS))
+def test_weekday_holidays_match_day_walk(year):
+    weekdays = _weekdays(year)
+    business = default_calendar().is_business_day(weekdays)
+    assert sorted(str(day) for day in weekdays[~business]) == WEEKDAY_HOLIDAYS[year]
+
+def test_easter():
+    dates = easter([2000, 2019, 2024, 2025, 2038])
+    assert [str(day) for day in dates] == ['2000-04-23', '2019-04-21', '2024-03-31', '2025-04-20', '2038-04-25']
+
+def test_movable_holidays():
+    calendar = default_calendar()
+    # Carnaval (segunda e terça) e Corpus Christi não são dias úteis; a Quarta-feira de Cinzas é
+    assert not calendar.is_business_day(['2024-02-12', '2024-02-13', '2024-05-30']).any()
+    assert calendar.is_business_day(['2024-02-14', '2024-05-31']).all()
+
+def test_consciencia_negra_only_from_2024():
+    calendar = default_calendar()
+    assert calendar.is_business_day(['2023-11-20'])[0]  # segunda-feira, antes da Lei 14.759/2023
+    assert not calendar.is_business_day(['2024-11-20', '2025-11-20']).any()
+
+def test_business_days_match_day_by_day_count():
+    calendar = default_calendar()
+    rng = np.random.default_rng(0)
+    first = np.datetime64('2015-01-01')
+    days = np.arange(first, np.datetime64('2031-01-01'))
+    business = calendar.is_business_day(days)
+    for start, end in rng.integers(0, len(days), size=(200, 2)):
+        start, end = sorted((int(start), int(end)))
+        assert calendar.business_days(days[start], days[end]) == business[start:end].sum()
+    assert calendar.business_days('2024-03-01', '2024-02-01') == -calendar.business_days('2024-02-01', '2024-03-01')
+
+def test_out_of_range_dates():
+    with pytest.raises(ValueError):
+        default_calendar().business_days('1989-12-31', '2000-01-01')
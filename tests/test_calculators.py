@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from investdata.fii import calculateFinalBatch, calculateProfit, calculateProfitBatch
+from investdata.fixed_income import (calculate_cdb, calculate_lci_lca, calculate_savings, cdb_curve, cdb_value,
+                                     lci_lca_curve, lci_lca_value, savings_curve, savings_value)
+from investdata.incremental import extend_curve, extend_funds
+from investdata.piggybank import calcular_cdi, valor_cofrinho
+
+HORIZON = 600
+MONTHS = np.arange(0, HORIZON + 1, 7)
+FUNDS = [(10.0, 0.12, 100, 2), (97.5, 0.085, 13, 0), (8.3, 0.14, 1000, 5)]  # (preço, DY, cotas iniciais, cotas mensais)
+
+def _batch_inputs(funds):
+    prices, dys, shares, monthly = zip(*funds)
+    return prices, dys, shares, monthly
+
+def test_fixed_income_curve_matches_scalar():
+    for initial, rate, cdi, contribution in [(1000.0, 100.0, 11.5, 100.0), (0.0, 120.0, 13.65, 50.0)]:
+        np.testing.assert_allclose(cdb_curve(initial, rate, cdi, HORIZON, contribution)[MONTHS[1:]],
+                                   [calculate_cdb(initial, rate, cdi, m / 12, contribution) for m in MONTHS[1:]], rtol=1e-12)
+        np.testing.assert_allclose(lci_lca_curve(initial, rate, cdi, HORIZON, contribution)[MONTHS[1:]],
+                                   [calculate_lci_lca(initial, rate, cdi, m / 12, contribution) for m in MONTHS[1:]], rtol=1e-12)
+    for selic in (7.0, 10.5):
+        np.testing.assert_allclose(savings_curve(1000.0, selic, HORIZON, 100.0, 0.0744)[MONTHS],
+                                   [calculate_savings(1000.0, selic, m / 12, 100.0, 0.0744) for m in MONTHS], rtol=1e-12)
+
+def test_fixed_income_vector_matches_scalar():
+    for initial, rate, cdi, contribution in [(1000.0, 100.0, 11.5, 100.0), (0.0, 120.0, 13.65, 50.0)]:
+        np.testing.assert_allclose(cdb_value(initial, rate, cdi, MONTHS[1:], contribution),
+                                   [calculate_cdb(initial, rate, cdi, m / 12, contribution) for m in MONTHS[1:]], rtol=1e-12)
+        np.testing.assert_allclose(lci_lca_value(initial, rate, cdi, MONTHS[1:], contribution),
+                                   [calculate_lci_lca(initial, rate, cdi, m / 12, contribution) for m in MONTHS[1:]], rtol=1e-12)
+    for selic in (7.0, 10.5):
+        np.testing.assert_allclose(savings_value(1000.0, selic, MONTHS, 100.0, 0.0744),
+                                   [calculate_savings(1000.0, selic, m / 12, 100.0, 0.0744) for m in MONTHS], rtol=1e-12)
+
+def test_cofrinho_vector_matches_scalar():
+    np.testing.assert_allclose(valor_cofrinho(11.5, 1000.0, MONTHS, 100.0, 1.02),
+                               [calcular_cdi(11.5, 1000.0, m, 100.0, "Meses", 1.02) for m in MONTHS], rtol=1e-12)
+
+def test_zero_rate_contributions():
+    np.testing.assert_allclose(lci_lca_curve(1000.0, 0.0, 11.5, 12, 100.0), 1000.0 + 100.0 * np.arange(13))
+
+def test_fii_batch_matches_scalar_exactly():
+    profit, monthly, investment, _ = calculateProfitBatch(*_batch_inputs(FUNDS), 240)
+    for row, (price, dy, shares, monthlyShares) in enumerate(FUNDS):
+        expected = calculateProfit(price, dy, shares, monthlyShares, 240)
+        assert profit[row].tolist() == expected[0]
+        assert monthly[row].tolist() == expected[1]
+        assert investment[row].tolist() == expected[2]
+
+def test_fii_final_batch_matches_last_month():
+    months = [1, 60, 240]
+    final = calculateFinalBatch(*_batch_inputs(FUNDS), months)
+    full = calculateProfitBatch(*_batch_inputs(FUNDS), max(months))
+    for row, month in enumerate(months):
+        assert [values[row] for values in final] == [values[row, month - 1] for values in full]
+
+def test_fii_final_batch_zero_months():
+    profit, monthly, investment, shares = calculateFinalBatch([10.0], [0.12], [100], [2], [0])
+    assert (profit[0], monthly[0], investment[0], shares[0]) == (0.0, 0.0, 1000.0, 100.0)
+
+def test_extend_funds_matches_full_simulation():
+    checkpoints = []
+    funds = [(dy, price, shares, monthly) for price, dy, shares, monthly in FUNDS]
+    for months, funds in [(24, funds), (120, funds), (60, funds), (180, [funds[0], (0.2, *funds[1][1:]), funds[2]])]:
+        checkpoints, *series = extend_funds(checkpoints, funds, months)
+        dys, prices, shares, monthly = zip(*funds)
+        for values, expected in zip(series, calculateProfitBatch(prices, dys, shares, monthly, months)):
+            assert np.array_equal(values, expected)
+
+@pytest.mark.parametrize('horizons', [(12, 120, 60, 600), (600, 1, 300)])
+def test_extend_curve_matches_full_curve(horizons):
+    def compute(month_range):
+        return cdb_value(1000.0, 110.0, 11.5, month_range, 100.0)
+
+    checkpoint = None
+    for months in horizons:
+        checkpoint, values = extend_curve(checkpoint, ('cdb',), months, compute)
+        assert np.array_equal(values, compute(np.arange(months + 1)))
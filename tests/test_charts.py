@@ -0,0 +1,43 @@
+import math
+
+import numpy as np
+
+from investdata.charts import downsample_indices, lttb_indices
+
+# Implementação de referência do LTTB (Steinarsson, 2013), ponto a ponto
+def reference_lttb(x, y, threshold):
+    n = len(y)
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    sampled = [0]
+    for i in range(threshold - 2):
+        average_start = int(math.floor((i + 1) * every)) + 1
+        average_end = min(int(math.floor((i + 2) * every)) + 1, n)
+        average_x = sum(x[average_start:average_end]) / (average_end - average_start)
+        average_y = sum(y[average_start:average_end]) / (average_end - average_start)
+
+        max_area = -1
+        for j in range(int(math.floor(i * every)) + 1, int(math.floor((i + 1) * every)) + 1):
+            area = abs((x[a] - average_x) * (y[j] - y[a]) - (x[a] - x[j]) * (average_y - y[a])) * 0.5
+            if area > max_area:
+                max_area, chosen = area, j
+        sampled.append(chosen)
+        a = chosen
+    sampled.append(n - 1)
+    return sampled
+
+def test_lttb_matches_reference():
+    rng = np.random.default_rng(1)
+    for n, threshold in [(10, 3), (100, 7), (601, 400), (3601, 400), (1000, 999)]:
+        x = np.arange(n, dtype=float)
+        y = np.cumsum(rng.standard_normal(n))
+        assert lttb_indices(x, y, threshold).tolist() == reference_lttb(x.tolist(), y.tolist(), threshold)
+
+def test_lttb_short_series_unchanged():
+    assert lttb_indices(np.arange(5), np.arange(5), 10).tolist() == [0, 1, 2, 3, 4]
+
+def test_downsample_keeps_endpoints_of_every_series():
+    x = np.arange(2000)
+    indices = downsample_indices([np.sin(x / 50), np.cos(x / 70)], 100)
+    assert indices[0] == 0 and indices[-1] == 1999
+    assert np.all(np.diff(indices) > 0) and len(indices) <= 200